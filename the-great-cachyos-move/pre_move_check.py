@@ -1,30 +1,59 @@
 #!/usr/bin/env python3
 import subprocess
-import shutil
 import sys
 import os
+import json
 
-def run_command(command):
-    """Runs a shell command and returns the output."""
+def run_command(argv):
+    """Runs a command (argv list, no shell) and returns the output."""
     try:
         result = subprocess.run(
-            command, shell=True, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            argv, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
         )
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
-        print(f"Error running command: {command}")
+        print(f"Error running command: {' '.join(argv)}")
         print(e.stderr)
         return None
+    except FileNotFoundError:
+        # Without a shell there is no exit status 127; report it the same way
+        print(f"Error running command: {' '.join(argv)}")
+        print(f"{argv[0]}: command not found")
+        return None
+
+_mounts = None
+
+def get_mounts():
+    """Returns the mount table as findmnt dicts (target/source/fstype).
+
+    findmnt is run once and the parsed result is shared by every check.
+    """
+    global _mounts
+    if _mounts is None:
+        output = run_command(["findmnt", "-J", "-l", "-o", "TARGET,SOURCE,FSTYPE"])
+        _mounts = json.loads(output)["filesystems"] if output else []
+    return _mounts
+
+def get_root_source():
+    """Returns the device backing /, without any [subvol] suffix."""
+    for m in get_mounts():
+        if m['target'] == '/':
+            return m['source'].split('[')[0]
+    return ""
 
 def check_if_target_empty(device_name):
     """Checks if the target device is mounted and non-empty."""
     # List all mountpoints for this device
     # lsblk can help, we look for anything starting with /dev/device_name
-    mounts = run_command(f"findmnt -n -o TARGET -S /dev/{device_name}")
+    mounts = "\n".join(
+        m['target'] for m in get_mounts()
+        if m['source'].split('[')[0] == f"/dev/{device_name}"
+    )
     if not mounts:
          # Also check potential partitions if the device itself isn't mounted (e.g. nvme1n1p1)
          # We need to list all partitions of the device and their mounts.
-         mounts = run_command(f"lsblk -ln -o MOUNTPOINT /dev/{device_name} | grep -v '^$'")
+         # Blank lines (unmounted partitions) strip away or are skipped below
+         mounts = run_command(["lsblk", "-ln", "-o", "MOUNTPOINT", f"/dev/{device_name}"])
          if not mounts:
              return True # Not mounted anywhere
 
@@ -36,9 +65,14 @@ def check_if_target_empty(device_name):
         if not os.path.exists(mp):
             continue
             
-        # Check for files (ignoring lost+found)
-        files = os.listdir(mp)
-        files = [f for f in files if f != 'lost+found']
+        # Check for files (ignoring lost+found). Stop scanning once we have
+        # enough names to report; a sixth entry only tells us to print '...'.
+        files = []
+        with os.scandir(mp) as it:
+            for entry in it:
+                if entry.name == 'lost+found': continue
+                files.append(entry.name)
+                if len(files) > 5: break
         if files:
             print(f"CRITICAL FAIL: Target device mountpoint '{mp}' is not empty!")
             print(f"Found files: {files[:5]} {'...' if len(files)>5 else ''}")
@@ -54,8 +88,8 @@ def check_fstab(device):
     print(f"\n[Config Check] Checking /etc/fstab for {device} references")
     
     # Needs UUID and PartUUID to be thorough
-    uuid_output = run_command(f"lsblk -no UUID /dev/{device}")
-    partuuid_output = run_command(f"lsblk -no PARTUUID /dev/{device}")
+    uuid_output = run_command(["lsblk", "-no", "UUID", f"/dev/{device}"])
+    partuuid_output = run_command(["lsblk", "-no", "PARTUUID", f"/dev/{device}"])
     
     # Collect all identifiers for device and its partitions
     identifiers = [device]
@@ -63,16 +97,20 @@ def check_fstab(device):
     if partuuid_output: identifiers.extend(partuuid_output.split())
     
     # Also get checks for partitions (e.g. nvme1n1p1)
-    parts = run_command(f"lsblk -ln -o NAME /dev/{device}").split()
+    parts = run_command(["lsblk", "-ln", "-o", "NAME", f"/dev/{device}"]).split()
     for p in parts:
         if p == device: continue
         identifiers.append(p)
-        p_uuid = run_command(f"lsblk -no UUID /dev/{p}")
+        p_uuid = run_command(["lsblk", "-no", "UUID", f"/dev/{p}"])
         if p_uuid: identifiers.extend(p_uuid.split())
-        p_partuuid = run_command(f"lsblk -no PARTUUID /dev/{p}")
+        p_partuuid = run_command(["lsblk", "-no", "PARTUUID", f"/dev/{p}"])
         if p_partuuid: identifiers.extend(p_partuuid.split())
         
-    fstab_content = run_command("cat /etc/fstab")
+    try:
+        with open("/etc/fstab") as f:
+            fstab_content = f.read()
+    except OSError:
+        fstab_content = None
     if not fstab_content:
         print("Warning: Could not read /etc/fstab")
         return True # Soft pass but suspicious
@@ -94,10 +132,20 @@ def check_fstab(device):
 def check_dependencies():
     """Checks if required commands are available."""
     dependencies = ['lsblk', 'btrfs', 'grep', 'findmnt', 'sgdisk']
-    missing = []
-    for dep in dependencies:
-        if shutil.which(dep) is None:
-            missing.append(dep)
+    # List each PATH directory once instead of stat-ing every dep in every dir
+    needed = set(dependencies)
+    found = set()
+    for d in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if not d: continue
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.name in needed and os.access(entry.path, os.X_OK):
+                        found.add(entry.name)
+        except OSError:
+            continue
+        if found == needed: break
+    missing = [dep for dep in dependencies if dep not in found]
     
     if missing:
         print(f"Error: Missing dependencies: {', '.join(missing)}")
@@ -107,32 +155,38 @@ def check_dependencies():
 
 def get_device_info(device_name):
     """Gets model and size of a block device."""
-    output = run_command(f"lsblk -dn -o MODEL,SIZE /dev/{device_name}")
+    output = run_command(["lsblk", "-dn", "-o", "MODEL,SIZE", f"/dev/{device_name}"])
     if output:
         return output
     return "Unknown"
 
 def is_btrfs(path):
     """Checks if a path is on a btrfs filesystem."""
-    output = run_command(f"findmnt -n -o FSTYPE -T {path}")
-    return output == 'btrfs'
+    # The mount containing path is the one with the longest matching target
+    path = os.path.realpath(path)
+    best = None
+    for m in get_mounts():
+        target = m['target']
+        if path == target or path.startswith(target.rstrip('/') + '/'):
+            if best is None or len(target) > len(best['target']):
+                best = m
+    return best is not None and best['fstype'] == 'btrfs'
 
 
 def get_all_active_subvolumes(root_device):
     """Gets all subvolumes mounted from the root device."""
     # Find active mounts for the device
-    output = run_command(f"findmnt -l -o TARGET,SOURCE,FSTYPE")
-    if not output: return []
+    mounts = get_mounts()
+    if not mounts: return []
     
     subvols = []
     # Identify the partition name, e.g. /dev/sdd2 from root mount
-    root_src = run_command("findmnt -n -o SOURCE /").split('[')[0]
+    root_src = get_root_source()
     
-    for line in output.split('\n'):
-        if root_src in line and 'btrfs' in line:
-            parts = line.split()
-            target = parts[0]
-            source = parts[1]
+    for m in mounts:
+        if root_src in m['source'] and m['fstype'] == 'btrfs':
+            target = m['target']
+            source = m['source']
             if '[' in source and ']' in source:
                  subvol_name = source.split('[')[1].split(']')[0]
                  print(f"Found active subvolume: {subvol_name} mounted at {target}")
@@ -147,30 +201,43 @@ def generate_runbook(subvolumes, dest_device):
     
     print(f"\n[!] TARGET DEVICE: /dev/{dest_device}")
     
+    # Shell helpers emitted once ahead of the steps so the repeated
+    # teardown and kernel-resync sequences are a single call each
+    helpers = [
+        "# Helpers",
+        "prep_device() {",
+        "    local d=$1",
+        "    fuser -k -m /dev/$d* || true",
+        "    sleep 1",
+        "    umount -R -f /dev/$d* || true",
+        "    swapoff /dev/$d* || true",
+        "}",
+        "wait_kernel() {",
+        "    local d=$1",
+        "    partprobe /dev/$d || true",
+        "    udevadm settle",
+        "    sleep ${2:-2}",
+        "}",
+    ]
+
     steps = [
         f"# 1. Wipe and Partition /dev/{dest_device}",
         f"# Ensure absolutely nothing is mounted (nuclear option)",
-        f"fuser -k -m /dev/{dest_device}* || true",
-        f"sleep 1",
-        f"umount -R -f /dev/{dest_device}* || true",
+        f"prep_device {dest_device}",
         f"umount -R -f /mnt/Data1 || true", 
-        f"swapoff /dev/{dest_device}* || true",
         
         f"# Clear signatures (ignore errors if device invalid)",
         f"wipefs --all --force /dev/{dest_device}* || true",
         f"sgdisk --zap-all /dev/{dest_device}",
         
         f"# Force kernel to drop old partitions (RETRIES)",
-        f"partprobe /dev/{dest_device} || true",
-        f"sleep 2",
-        f"partprobe /dev/{dest_device} || true",
-        f"udevadm settle",
-        f"sleep 2",
+        f"wait_kernel {dest_device}",
+        f"wait_kernel {dest_device}",
         
         f"# Create new partitions",
         f"sgdisk -n 1:0:+1024M -t 1:ef00 -c 1:'CachyOS EFI' /dev/{dest_device}",
         f"sgdisk -n 2:0:0 -t 2:8300 -c 2:'CachyOS Root' /dev/{dest_device}",
-        f"# Sync again",
+        f"# Sync again (strict: the new partition table must be picked up)",
         f"partprobe /dev/{dest_device}",
         f"udevadm settle",
         f"sleep 5", # Increased wait time
@@ -235,7 +302,7 @@ def generate_runbook(subvolumes, dest_device):
     kernel_pkg = "linux-cachyos" # Default fallback
     try:
         # Check for linux-cachyos, linux, or linux-lts
-        installed_kernels = run_command("pacman -Q | grep '^linux' | awk '{print $1}'").split('\n')
+        installed_kernels = set(run_command(["pacman", "-Qq"]).split())
         # Prioritize linux-cachyos, then linux, then linux-lts
         if "linux-cachyos" in installed_kernels:
             kernel_pkg = "linux-cachyos"
@@ -261,36 +328,52 @@ def generate_runbook(subvolumes, dest_device):
         f"echo \"Migration Complete. If verify PASSED, you can reboot.\""
     ])
     
-    for step in steps:
-        print(step)
+    header = [
+        "#!/bin/bash",
+        "# Error Handling Traps",
+        "set -e",
+        "set -E  # ERR trap also fires inside the helper functions",
+        "trap 'echo \"[ERROR] Command failed at line $LINENO: $BASH_COMMAND\"; exit 1' ERR",
+        "echo \"[INFO] Starting Migration Runbook...\"",
+        "# AUTO-GENERATED MIGRATION PLAN - DO NOT RUN BLINDLY",
+    ]
+    runbook = "\n".join(header + helpers + steps) + "\n"
+    sys.stdout.write(runbook)
 
     # Save to file
     with open("migration_runbook.sh", "w") as f:
-        f.write("#!/bin/bash\n")
-        f.write("# Error Handling Traps\n")
-        f.write("set -e\n")
-        f.write("trap 'echo \"[ERROR] Command failed at line $LINENO: $BASH_COMMAND\"; exit 1' ERR\n")
-        f.write("echo \"[INFO] Starting Migration Runbook...\"\n")
-        f.write("# AUTO-GENERATED MIGRATION PLAN - DO NOT RUN BLINDLY\n")
-        for step in steps:
-            f.write(step + "\n")
+        f.write(runbook)
     print(f"\n[INFO] Runbook saved to: {os.path.abspath('migration_runbook.sh')}")
 
 def save_package_lists():
     """Saves lists of installed packages."""
     print(f"\n[Inventorying Packages]")
     
-    # Explicit Native
-    run_command("pacman -Qne > pkglist_native.txt")
-    print("Saved pkglist_native.txt")
+    # One full listing with versions; explicit/foreign are name-only queries
+    # used to classify it, so the sync DBs are only consulted once (-Qm)
+    all_pkgs = run_command(["pacman", "-Q"]) or ""
+    explicit = set((run_command(["pacman", "-Qeq"]) or "").split())
+    foreign = set((run_command(["pacman", "-Qmq"]) or "").split())
     
-    # Explicit AUR/Foreign
-    run_command("pacman -Qme > pkglist_aur.txt")
-    print("Saved pkglist_aur.txt")
+    native_lines = []
+    aur_lines = []
+    for line in all_pkgs.splitlines():
+        name = line.split(' ', 1)[0]
+        if name not in explicit: continue
+        if name in foreign:
+            aur_lines.append(line)
+        else:
+            native_lines.append(line)
     
-    # All
-    run_command("pacman -Q > pkglist_all.txt")
-    print("Saved pkglist_all.txt")
+    lists = [
+        ("pkglist_native.txt", native_lines),  # Explicit Native
+        ("pkglist_aur.txt", aur_lines),  # Explicit AUR/Foreign
+        ("pkglist_all.txt", all_pkgs.splitlines()),  # All
+    ]
+    for filename, lines in lists:
+        with open(filename, "w") as f:
+            f.write("".join(line + "\n" for line in lines))
+        print(f"Saved {filename}")
 
 
 def main():
@@ -321,7 +404,7 @@ def main():
     
     # Safety Check: Ensure we aren't targeting the boot drive by accident
     # Simple check: is / mounted on it?
-    root_dev = run_command("findmnt -n -o SOURCE /").split('[')[0]
+    root_dev = get_root_source()
     if DEST_DEVICE in root_dev:
          print(f"CRITICAL FAIL: Destination device {DEST_DEVICE} is currently mounted as ROOT! Aborting.")
          sys.exit(1)
@@ -10,7 +10,23 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
 
+LOG_LINES = "\n".join([
+    "[14:30:05] Monitor thread started",
+    "[14:30:05] Monitoring enabled",
+    "[14:32:05] Work VPN: Checking 2 assert(s)...",
+    "[14:32:06] Work VPN: DNS check PASSED: myip.opendns.com resolves to 100.64.1.5 [PASSED]",
+    "[14:32:06] Work VPN: Geolocation check PASSED: city='Las Vegas' [PASSED]",
+])
+
+
+DOT_STYLE_CONNECTED = "color: green; font-size: 16px;"
+DOT_STYLE_DISCONNECTED = "color: gray; font-size: 16px;"
+
+
 class MockVPNWidget(QFrame):
+    # Shared bold header font, created on first use (needs a QApplication)
+    _BOLD_FONT = None
+
     def __init__(self, name: str, connected: bool, info_text: str, info_color: str):
         super().__init__()
         self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
@@ -19,14 +35,15 @@ class MockVPNWidget(QFrame):
         # Header
         header = QHBoxLayout()
         dot = QLabel("●")
-        color = "green" if connected else "gray"
-        dot.setStyleSheet(f"color: {color}; font-size: 16px;")
+        dot.setStyleSheet(DOT_STYLE_CONNECTED if connected else DOT_STYLE_DISCONNECTED)
         header.addWidget(dot)
 
         name_label = QLabel(name)
-        font = QFont()
-        font.setBold(True)
-        name_label.setFont(font)
+        if MockVPNWidget._BOLD_FONT is None:
+            font = QFont()
+            font.setBold(True)
+            MockVPNWidget._BOLD_FONT = font
+        name_label.setFont(MockVPNWidget._BOLD_FONT)
         header.addWidget(name_label)
         header.addStretch()
 
@@ -98,11 +115,7 @@ class MockCurrentWindow(QMainWindow):
         log_text = QTextEdit()
         log_text.setReadOnly(True)
         log_text.setMaximumHeight(150)
-        log_text.append("[14:30:05] Monitor thread started")
-        log_text.append("[14:30:05] Monitoring enabled")
-        log_text.append("[14:32:05] Work VPN: Checking 2 assert(s)...")
-        log_text.append("[14:32:06] Work VPN: DNS check PASSED: myip.opendns.com resolves to 100.64.1.5 [PASSED]")
-        log_text.append("[14:32:06] Work VPN: Geolocation check PASSED: city='Las Vegas' [PASSED]")
+        log_text.setPlainText(LOG_LINES)
         log_layout.addWidget(log_text)
         log_group.setLayout(log_layout)
         main_layout.addWidget(log_group)
@@ -1,8 +1,6 @@
 #!/usr/bin/env python3
 """Mockup of the NEW vpn-toggle v3.0 layout for spec documentation."""
 import sys
-import math
-import random
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -21,7 +19,25 @@ except Exception as e:
     HAS_PYQTGRAPH = False
 
 
+LOG_LINES = "\n".join([
+    "[14:30:05] Monitor thread started",
+    "[14:30:05] Monitoring enabled",
+    "[14:32:05] Work VPN: Checking 2 assert(s)...",
+    "[14:32:06] Work VPN: DNS check PASSED [845ms]",
+    "[14:32:07] Work VPN: Geolocation check PASSED [797ms]",
+    "[14:34:05] Personal VPN: Checking 1 assert(s)...",
+    "[14:34:06] Personal VPN: DNS check PASSED [412ms]",
+])
+
+
+DOT_STYLE_CONNECTED = "color: green; font-size: 16px;"
+DOT_STYLE_DISCONNECTED = "color: gray; font-size: 16px;"
+
+
 class MockVPNWidget(QFrame):
+    # Shared bold header font, created on first use (needs a QApplication)
+    _BOLD_FONT = None
+
     def __init__(self, name: str, connected: bool, info_text: str,
                  info_color: str, stats_text: str = ""):
         super().__init__()
@@ -31,14 +47,15 @@ class MockVPNWidget(QFrame):
         # Header
         header = QHBoxLayout()
         dot = QLabel("●")
-        color = "green" if connected else "gray"
-        dot.setStyleSheet(f"color: {color}; font-size: 16px;")
+        dot.setStyleSheet(DOT_STYLE_CONNECTED if connected else DOT_STYLE_DISCONNECTED)
         header.addWidget(dot)
 
         name_label = QLabel(name)
-        font = QFont()
-        font.setBold(True)
-        name_label.setFont(font)
+        if MockVPNWidget._BOLD_FONT is None:
+            font = QFont()
+            font.setBold(True)
+            MockVPNWidget._BOLD_FONT = font
+        name_label.setFont(MockVPNWidget._BOLD_FONT)
         header.addWidget(name_label)
         header.addStretch()
 
@@ -71,48 +88,34 @@ class MockVPNWidget(QFrame):
 
 def generate_synthetic_data(n_points: int = 60):
     """Generate synthetic latency data with failures and a bounce event."""
-    random.seed(42)
-    timestamps = list(range(n_points))
-    latencies = []
-    successes = []
-    bounce_indices = []
-
-    for i in range(n_points):
-        base = 600 + 200 * math.sin(i / 8.0)
-        noise = random.gauss(0, 50)
-        latency = base + noise
-
-        # Inject a failure spike around index 20-22
-        if 20 <= i <= 22:
-            latency = base + 400 + random.gauss(0, 30)
-            successes.append(False)
-        # Inject another failure around index 45
-        elif i == 45:
-            latency = base + 350
-            successes.append(False)
-        else:
-            successes.append(True)
+    rng = np.random.default_rng(42)
+    timestamps = np.arange(n_points, dtype=float)
+    base = 600 + 200 * np.sin(timestamps / 8.0)
+    latencies = base + rng.normal(0, 50, n_points)
 
-        latencies.append(max(100, latency))
+    # Inject a failure spike around index 20-22 and another around index 45
+    successes = np.ones(n_points, dtype=bool)
+    successes[20:23] = False
+    successes[45] = False
+    latencies[20:23] = base[20:23] + 400 + rng.normal(0, 30, 3)
+    latencies[45] = base[45] + 350
+
+    np.maximum(latencies, 100, out=latencies)
 
     # Bounce at index 23 (after the failure cluster)
-    bounce_indices.append(23)
+    bounce_indices = [23]
 
     return timestamps, latencies, successes, bounce_indices
 
 
 def generate_vpn2_data(n_points: int = 60):
     """Generate synthetic data for a second VPN (shorter, starts later)."""
-    random.seed(99)
-    timestamps = list(range(30, 60))
-    latencies = []
-    successes = []
-
-    for i in range(len(timestamps)):
-        base = 400 + 100 * math.sin(i / 6.0)
-        noise = random.gauss(0, 30)
-        latencies.append(max(80, base + noise))
-        successes.append(True)
+    rng = np.random.default_rng(99)
+    timestamps = np.arange(30, 60, dtype=float)
+    i = np.arange(len(timestamps))
+    latencies = 400 + 100 * np.sin(i / 6.0) + rng.normal(0, 30, len(timestamps))
+    np.maximum(latencies, 80, out=latencies)
+    successes = np.ones(len(timestamps), dtype=bool)
 
     return timestamps, latencies, successes, []
 
@@ -188,26 +191,26 @@ class MockNewWindow(QMainWindow):
 
             # VPN 1 data
             ts1, lat1, suc1, bounces1 = generate_synthetic_data()
-            ts1_arr = np.array(ts1, dtype=float)
-            lat1_arr = np.array(lat1, dtype=float)
 
             # Line
-            plot_widget.plot(ts1_arr, lat1_arr, pen=pg.mkPen('#4fc3f7', width=2),
+            plot_widget.plot(ts1, lat1, pen=pg.mkPen('#4fc3f7', width=2),
                              name='Work VPN')
 
-            # Pass markers (green dots)
-            pass_x = [ts1[i] for i in range(len(ts1)) if suc1[i]]
-            pass_y = [lat1[i] for i in range(len(lat1)) if suc1[i]]
-            plot_widget.plot(pass_x, pass_y, pen=None,
-                             symbol='o', symbolSize=5,
-                             symbolBrush='#4caf50', symbolPen=None)
-
-            # Fail markers (red X)
-            fail_x = [ts1[i] for i in range(len(ts1)) if not suc1[i]]
-            fail_y = [lat1[i] for i in range(len(lat1)) if not suc1[i]]
-            plot_widget.plot(fail_x, fail_y, pen=None,
-                             symbol='x', symbolSize=12,
-                             symbolBrush='#f44336', symbolPen=pg.mkPen('#f44336', width=2))
+            # Pass markers (green dots) and fail markers (red X) share one
+            # scatter item; brushes/pens are reused across points
+            pass_brush = pg.mkBrush('#4caf50')
+            fail_brush = pg.mkBrush('#f44336')
+            no_pen = pg.mkPen(None)
+            fail_pen = pg.mkPen('#f44336', width=2)
+            markers = pg.ScatterPlotItem()
+            markers.addPoints(
+                x=ts1, y=lat1,
+                symbol=np.where(suc1, 'o', 'x'),
+                size=np.where(suc1, 5, 12),
+                brush=[pass_brush if ok else fail_brush for ok in suc1],
+                pen=[no_pen if ok else fail_pen for ok in suc1],
+            )
+            plot_widget.addItem(markers)
 
             # Bounce markers (vertical red dashed lines)
             for b_idx in bounces1:
@@ -217,18 +220,16 @@ class MockNewWindow(QMainWindow):
                 )
                 plot_widget.addItem(bounce_line)
                 bounce_label = pg.TextItem("Bounce", color='#f44336', anchor=(0, 1))
-                bounce_label.setPos(b_idx, max(lat1) * 0.95)
+                bounce_label.setPos(b_idx, lat1.max() * 0.95)
                 plot_widget.addItem(bounce_label)
 
             # VPN 2 data
             ts2, lat2, suc2, _ = generate_vpn2_data()
-            ts2_arr = np.array(ts2, dtype=float)
-            lat2_arr = np.array(lat2, dtype=float)
-            plot_widget.plot(ts2_arr, lat2_arr, pen=pg.mkPen('#ffb74d', width=2),
-                             name='Personal VPN')
-            plot_widget.plot(ts2, lat2, pen=None,
+            # Line and pass markers in one item (VPN 2 has no failures)
+            plot_widget.plot(ts2, lat2, pen=pg.mkPen('#ffb74d', width=2),
                              symbol='o', symbolSize=5,
-                             symbolBrush='#4caf50', symbolPen=None)
+                             symbolBrush='#4caf50', symbolPen=None,
+                             name='Personal VPN')
 
             metrics_layout.addWidget(plot_widget)
         else:
@@ -251,13 +252,7 @@ class MockNewWindow(QMainWindow):
         log_text = QTextEdit()
         log_text.setReadOnly(True)
         log_text.setMaximumHeight(120)
-        log_text.append("[14:30:05] Monitor thread started")
-        log_text.append("[14:30:05] Monitoring enabled")
-        log_text.append("[14:32:05] Work VPN: Checking 2 assert(s)...")
-        log_text.append("[14:32:06] Work VPN: DNS check PASSED [845ms]")
-        log_text.append("[14:32:07] Work VPN: Geolocation check PASSED [797ms]")
-        log_text.append("[14:34:05] Personal VPN: Checking 1 assert(s)...")
-        log_text.append("[14:34:06] Personal VPN: DNS check PASSED [412ms]")
+        log_text.setPlainText(LOG_LINES)
         log_layout.addWidget(log_text)
         log_group.setLayout(log_layout)
         main_layout.addWidget(log_group)
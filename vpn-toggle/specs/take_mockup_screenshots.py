@@ -4,7 +4,6 @@ import sys
 import os
 
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer
 
 # Add parent to path so mockups can be imported
 sys.path.insert(0, os.path.dirname(__file__))
@@ -32,16 +31,16 @@ def main():
     new_win = MockNewWindow()
     new_win.show()
 
-    def take_screenshots():
-        capture_window(current_win, "mockup-current-layout.png")
-        capture_window(new_win, "mockup-new-layout.png")
-        print("Done. Closing.")
-        app.quit()
-
-    # Wait 500ms for windows to fully render before capturing
-    QTimer.singleShot(500, take_screenshots)
-    app.exec()
+    # Flush pending show/layout events and force a paint so the grabs see
+    # fully rendered windows; no event loop is needed after that
+    app.processEvents()
+    current_win.repaint()
+    new_win.repaint()
+    app.processEvents()
 
+    capture_window(current_win, "mockup-current-layout.png")
+    capture_window(new_win, "mockup-new-layout.png")
+    print("Done.")
 
 if __name__ == "__main__":
     main()
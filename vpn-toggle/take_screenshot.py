@@ -7,10 +7,8 @@ with synthetic data loaded into the graph to produce an interesting screenshot.
 """
 import sys
 import os
-import random
-import math
 from datetime import datetime, timedelta
-from tempfile import mkdtemp
+from typing import Optional
 
 # Add project to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -22,78 +20,126 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
-from pathlib import Path
 
-from vpn_toggle.metrics import MetricsCollector, DataPoint, AssertDetail
-from vpn_toggle.graph import MetricsGraphWidget
+# numpy and the pyqtgraph-backed graph widget are the slow imports; they are
+# loaded where used so importing this module only pays for QtWidgets
+from vpn_toggle.metrics import MetricsCollector, DataPoint, AggregateStats
 
 
 def generate_synthetic_data(collector: MetricsCollector):
     """Generate realistic-looking synthetic metrics data for two VPNs."""
-    random.seed(42)
-    now = datetime.now()
-    base = now - timedelta(hours=6)
+    import numpy as np
 
+    rng = np.random.default_rng(42)
+    n_points = 80
+    idx = np.arange(n_points)
+
+    # Check every 4.5 minutes (270s) over the last six hours, formatted in one shot
+    base = np.datetime64(datetime.now() - timedelta(hours=6), 's')
+    timestamps = np.datetime_as_string(base + idx * np.timedelta64(270, 's'), unit='s')
+
+    # fail_window: inclusive index range where failures cluster,
+    # bounce_at/bounce_latency: the failing check that triggers a bounce
     vpn_configs = [
-        {"name": "work-vpn", "base_latency": 820, "jitter": 150},
-        {"name": "personal-vpn", "base_latency": 450, "jitter": 80},
+        {"name": "work-vpn", "base_latency": 820, "jitter": 150,
+         "fail_window": (30, 33), "pass_rate": 0.3,
+         "bounce_at": 32, "bounce_latency": (5000, 500)},
+        {"name": "personal-vpn", "base_latency": 450, "jitter": 80,
+         "fail_window": (55, 57), "pass_rate": 0.4,
+         "bounce_at": 56, "bounce_latency": (4200, 300)},
     ]
 
+    points: list[DataPoint] = []
     for vpn in vpn_configs:
-        for i in range(80):
-            ts = base + timedelta(minutes=i * 4.5)
-
-            # Simulate realistic latency with occasional spikes
-            latency = vpn["base_latency"] + random.gauss(0, vpn["jitter"])
-            # Add periodic slow-wave pattern
-            latency += 60 * math.sin(i / 10.0)
-            # Occasional spikes
-            if random.random() < 0.08:
-                latency += random.uniform(300, 600)
-            latency = max(100, latency)
-
-            # Determine success/failure
-            success = True
-            bounce = False
-
-            # Cluster failures in a couple of spots
-            if vpn["name"] == "work-vpn" and 30 <= i <= 33:
-                success = random.random() < 0.3
-                if not success and i == 32:
-                    bounce = True
-                    latency = 5000 + random.uniform(0, 500)
-            elif vpn["name"] == "personal-vpn" and 55 <= i <= 57:
-                success = random.random() < 0.4
-                if not success and i == 56:
-                    bounce = True
-                    latency = 4200 + random.uniform(0, 300)
-
-            if not success:
-                latency = max(latency, 3000 + random.uniform(0, 2000))
-
-            # Build assert details
-            dns_latency = latency * 0.05 + random.gauss(0, 10)
-            geo_latency = latency * 0.95 + random.gauss(0, 20)
-
-            dp = DataPoint(
-                timestamp=ts.isoformat(),
+        # Simulate realistic latency with a periodic slow-wave pattern
+        latency = (vpn["base_latency"] + rng.normal(0, vpn["jitter"], n_points)
+                   + 60 * np.sin(idx / 10.0))
+        # Occasional spikes
+        spikes = rng.random(n_points) < 0.08
+        latency[spikes] += rng.uniform(300, 600, spikes.sum())
+        np.maximum(latency, 100, out=latency)
+
+        # Cluster failures in a couple of spots
+        lo, hi = vpn["fail_window"]
+        window = (idx >= lo) & (idx <= hi)
+        success = np.ones(n_points, dtype=bool)
+        success[window] = rng.random(window.sum()) < vpn["pass_rate"]
+
+        bounce = np.zeros(n_points, dtype=bool)
+        b = vpn["bounce_at"]
+        if not success[b]:
+            bounce[b] = True
+            floor, spread = vpn["bounce_latency"]
+            latency[b] = floor + rng.uniform(0, spread)
+
+        failed = ~success
+        latency[failed] = np.maximum(latency[failed],
+                                     3000 + rng.uniform(0, 2000, failed.sum()))
+
+        # Per-assert details are left empty: the collector is memory-only and
+        # neither the graph nor the stats row reads them
+
+        # Round and unbox every column once; the loop then only zips plain
+        # Python values instead of indexing NumPy scalars per field
+        rows = zip(
+            timestamps.tolist(),
+            np.round(latency, 1).tolist(),
+            success.tolist(),
+            bounce.tolist(),
+        )
+        for ts, lat, ok, bounced in rows:
+            points.append(DataPoint(
+                timestamp=ts,
                 vpn_name=vpn["name"],
-                latency_ms=round(latency, 1),
-                success=success,
-                bounce_triggered=bounce,
-                assert_details=[
-                    AssertDetail(type="dns_lookup", latency_ms=round(max(5, dns_latency), 1), success=success),
-                    AssertDetail(type="geolocation", latency_ms=round(max(50, geo_latency), 1), success=success),
-                ],
-            )
-            collector.record(dp)
+                latency_ms=lat,
+                success=ok,
+                bounce_triggered=bounced,
+            ))
+
+    collector.record_many(points)
+
+
+# Qt maps PNG "quality" q onto zlib level (100 - q) * 9 / 91, truncated;
+# 70 gives level 2, which encodes several times faster than the default
+# for a near-identical file size
+PNG_QUALITY = 70
+
+_GREEN_DOT_QSS = "color: green; font-size: 16px;"
+_GRAY_DOT_QSS = "color: gray; font-size: 16px;"
+_STATS_QSS = "color: #888888; font-size: 10px;"
+_INFO_QSS = {
+    color: f"color: {color}; font-size: 10px;"
+    for color in ("green", "gray", "red")
+}
+_BTN_LABELS = ("Connect", "Disconnect", "Bounce", "Configure")
+_LOG_LINES = (
+    "[14:30:05] Monitor thread started",
+    "[14:30:05] Monitoring enabled",
+    "[14:32:05] Work VPN: Checking 2 assert(s)...",
+    "[14:32:06] Work VPN: DNS check PASSED: myip.opendns.com resolves to 100.64.1.5 [PASSED]",
+    "[14:32:06] Work VPN: Geolocation check PASSED: city='Las Vegas' [PASSED]",
+    "[14:34:10] Personal VPN: Checking 2 assert(s)...",
+    "[14:34:11] Personal VPN: DNS check PASSED [PASSED]",
+    "[14:34:11] Personal VPN: Geolocation check PASSED: city='New York' [PASSED]",
+)
+
+
+def _format_stats(stats: Optional[AggregateStats]) -> str:
+    """Render the one-line stats summary shown under each VPN."""
+    if stats is None:
+        return "No data"
+    return (f"Avg: {stats.avg_latency_ms:.0f}ms | Total failures: {stats.total_failures}"
+            f" | Uptime: {stats.uptime_pct:.1f}%")
 
 
 class MockVPNWidget(QFrame):
     """Simplified VPN widget for screenshot purposes."""
 
+    # Shared bold header font, created on first use (needs a QApplication)
+    _BOLD_FONT: Optional[QFont] = None
+
     def __init__(self, name: str, connected: bool, info_text: str, info_color: str,
-                 stats_text: str):
+                 stats: Optional[AggregateStats] = None):
         super().__init__()
         self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
         layout = QVBoxLayout()
@@ -101,14 +147,15 @@ class MockVPNWidget(QFrame):
         # Header
         header = QHBoxLayout()
         dot = QLabel("\u25cf")
-        color = "green" if connected else "gray"
-        dot.setStyleSheet(f"color: {color}; font-size: 16px;")
+        dot.setStyleSheet(_GREEN_DOT_QSS if connected else _GRAY_DOT_QSS)
         header.addWidget(dot)
 
         name_label = QLabel(name)
-        font = QFont()
-        font.setBold(True)
-        name_label.setFont(font)
+        if MockVPNWidget._BOLD_FONT is None:
+            font = QFont()
+            font.setBold(True)
+            MockVPNWidget._BOLD_FONT = font
+        name_label.setFont(MockVPNWidget._BOLD_FONT)
         header.addWidget(name_label)
         header.addStretch()
 
@@ -119,18 +166,19 @@ class MockVPNWidget(QFrame):
         # Info row
         if info_text:
             info = QLabel(info_text)
-            info.setStyleSheet(f"color: {info_color}; font-size: 10px;")
+            info.setStyleSheet(
+                _INFO_QSS.get(info_color) or f"color: {info_color}; font-size: 10px;"
+            )
             layout.addWidget(info)
 
         # Stats row
-        if stats_text:
-            stats = QLabel(stats_text)
-            stats.setStyleSheet("color: #888888; font-size: 10px;")
-            layout.addWidget(stats)
+        stats_label = QLabel(_format_stats(stats))
+        stats_label.setStyleSheet(_STATS_QSS)
+        layout.addWidget(stats_label)
 
         # Buttons
         btn_layout = QHBoxLayout()
-        for label in ["Connect", "Disconnect", "Bounce", "Configure"]:
+        for label in _BTN_LABELS:
             btn = QPushButton(label)
             btn_layout.addWidget(btn)
         btn_layout.addStretch()
@@ -140,7 +188,7 @@ class MockVPNWidget(QFrame):
 
 
 class ScreenshotWindow(QMainWindow):
-    def __init__(self, metrics_collector: MetricsCollector):
+    def __init__(self, metrics_collector: MetricsCollector, graph_widget: QWidget):
         super().__init__()
         self.setWindowTitle("VPN Monitor v3.0")
         self.resize(1100, 650)
@@ -169,21 +217,21 @@ class ScreenshotWindow(QMainWindow):
         scroll_widget = QWidget()
         scroll_inner = QVBoxLayout()
 
-        # Work VPN stats from synthetic data
-        work_stats = metrics_collector.get_stats("work-vpn")
-        personal_stats = metrics_collector.get_stats("personal-vpn")
+        # VPN stats from synthetic data, computed once per VPN up front
+        stats_by_vpn = {
+            name: metrics_collector.get_stats(name)
+            for name in ("work-vpn", "personal-vpn")
+        }
 
         scroll_inner.addWidget(MockVPNWidget(
             "Work VPN", True,
             "\u2713 All checks passing | Last check: 2m ago", "green",
-            f"Avg: {work_stats.avg_latency_ms:.0f}ms | Total failures: {work_stats.total_failures} | Uptime: {work_stats.uptime_pct:.1f}%"
-            if work_stats else "No data"
+            stats_by_vpn["work-vpn"],
         ))
         scroll_inner.addWidget(MockVPNWidget(
             "Personal VPN", True,
             "\u2713 All checks passing | Last check: 1m ago", "green",
-            f"Avg: {personal_stats.avg_latency_ms:.0f}ms | Total failures: {personal_stats.total_failures} | Uptime: {personal_stats.uptime_pct:.1f}%"
-            if personal_stats else "No data"
+            stats_by_vpn["personal-vpn"],
         ))
         scroll_inner.addStretch()
         scroll_widget.setLayout(scroll_inner)
@@ -195,7 +243,7 @@ class ScreenshotWindow(QMainWindow):
         # Right: Graph
         metrics_group = QGroupBox("Metrics")
         metrics_layout = QVBoxLayout()
-        self.graph_widget = MetricsGraphWidget(metrics_collector)
+        self.graph_widget = graph_widget
         metrics_layout.addWidget(self.graph_widget)
         metrics_group.setLayout(metrics_layout)
         splitter.addWidget(metrics_group)
@@ -209,14 +257,8 @@ class ScreenshotWindow(QMainWindow):
         log_text = QTextEdit()
         log_text.setReadOnly(True)
         log_text.setMaximumHeight(120)
-        log_text.append("[14:30:05] Monitor thread started")
-        log_text.append("[14:30:05] Monitoring enabled")
-        log_text.append("[14:32:05] Work VPN: Checking 2 assert(s)...")
-        log_text.append("[14:32:06] Work VPN: DNS check PASSED: myip.opendns.com resolves to 100.64.1.5 [PASSED]")
-        log_text.append("[14:32:06] Work VPN: Geolocation check PASSED: city='Las Vegas' [PASSED]")
-        log_text.append("[14:34:10] Personal VPN: Checking 2 assert(s)...")
-        log_text.append("[14:34:11] Personal VPN: DNS check PASSED [PASSED]")
-        log_text.append("[14:34:11] Personal VPN: Geolocation check PASSED: city='New York' [PASSED]")
+        log_text.setUndoRedoEnabled(False)
+        log_text.setPlainText("\n".join(_LOG_LINES))
         log_layout.addWidget(log_text)
         log_group.setLayout(log_layout)
         main_layout.addWidget(log_group)
@@ -225,32 +267,44 @@ class ScreenshotWindow(QMainWindow):
 
 
 def main():
-    app = QApplication(sys.argv)
-
-    # Use temp directory for metrics so we don't pollute real data
-    tmp_dir = Path(mkdtemp(prefix="vpn-toggle-screenshot-"))
-    collector = MetricsCollector(metrics_dir=tmp_dir)
+    # Reuse an existing QApplication (e.g. when driven from a test) and only
+    # run/quit the event loop if we created it
+    app = QApplication.instance()
+    owns_app = app is None
+    if owns_app:
+        app = QApplication(sys.argv)
+
+    # Memory-only collector so we don't pollute real data or touch disk
+    collector = MetricsCollector(persist=False)
     generate_synthetic_data(collector)
 
-    win = ScreenshotWindow(collector)
+    from vpn_toggle.graph import MetricsGraphWidget
+
+    graph_widget = MetricsGraphWidget(collector)
+    graph_widget.enable_item_cache()
+    win = ScreenshotWindow(collector, graph_widget)
     win.show()
 
     def take_screenshot():
         script_dir = os.path.dirname(os.path.abspath(__file__))
         filepath = os.path.join(script_dir, "vpn-toggle-screenshot.png")
-        pixmap = win.grab()
-        pixmap.save(filepath, "PNG")
+        # Only the client area is wanted; the window has no menu/status bar
+        pixmap = win.centralWidget().grab()
+        pixmap.save(filepath, "PNG", PNG_QUALITY)
         print(f"Saved: {filepath}")
-
-        # Clean up temp metrics
-        import shutil
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-
-        app.quit()
-
-    # Wait for rendering
-    QTimer.singleShot(1000, take_screenshot)
-    app.exec()
+        if owns_app:
+            app.quit()
+
+    # Flush pending show/layout events and force a paint, then capture on the
+    # event loop's first pass instead of waiting a fixed delay
+    app.processEvents()
+    win.repaint()
+    if owns_app:
+        QTimer.singleShot(0, take_screenshot)
+        app.exec()
+    else:
+        app.processEvents()
+        take_screenshot()
 
 
 if __name__ == "__main__":
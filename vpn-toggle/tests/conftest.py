@@ -0,0 +1,85 @@
+"""
+Shared fixtures for the vpn-toggle test suite.
+
+Session-scoped fixtures are created once per pytest process, which under
+pytest-xdist (``pytest -n auto``) means once per worker. The QApplication comes from
+pytest-qt's session-scoped ``qapp`` fixture; widget tests register their
+windows with ``qtbot.addWidget`` so pytest-qt closes them on teardown.
+"""
+import copy
+import os
+import shutil
+
+# Must be set before anything imports PyQt6: headless runs use the offscreen
+# platform instead of probing for a display, and Qt debug chatter is muted.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("QT_LOGGING_RULES", "*.debug=false")
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from vpn_toggle.config import ConfigManager, DEFAULT_CONFIG
+
+from tests.helpers import copy_vpn_manager
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_config_fsync():
+    """Skip ConfigManager's fsync: tmp_path files don't need to survive a crash"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ConfigManager, "FSYNC_ON_SAVE", False)
+        yield
+
+
+@pytest.fixture
+def temp_config_file(tmp_path):
+    """Fixture to provide a unique temporary config file for each test"""
+    return tmp_path / "test_config.json"
+
+
+@pytest.fixture(scope="session")
+def _config_template(tmp_path_factory):
+    """A default config file written once per session"""
+    path = tmp_path_factory.mktemp("cfg_template") / "config.json"
+    ConfigManager(str(path))
+    return path
+
+
+@pytest.fixture
+def default_config_file(tmp_path, _config_template):
+    """A per-test copy of the default config (skips ConfigManager's initial save)"""
+    path = tmp_path / "config.json"
+    shutil.copyfile(_config_template, path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def _session_manager(tmp_path_factory):
+    """One ConfigManager (and backing file) shared by the whole session"""
+    return ConfigManager(str(tmp_path_factory.mktemp("vpn_cfg") / "test_config.json"))
+
+
+@pytest.fixture
+def config_manager(_session_manager):
+    """The shared ConfigManager, reset to defaults in memory and on disk"""
+    _session_manager.config = copy.deepcopy(DEFAULT_CONFIG)
+    _session_manager.save_config()
+    return _session_manager
+
+
+@pytest.fixture(scope="session")
+def _vpn_manager_template():
+    """A VPNManager built once, with subprocess.run reporting nmcli as installed"""
+    from vpn_toggle.vpn_manager import VPNManager  # imports PyQt6; keep it lazy
+
+    with patch('subprocess.run',
+               return_value=SimpleNamespace(returncode=0, stdout='/usr/bin/nmcli\n', stderr='')):
+        return VPNManager()
+
+
+@pytest.fixture
+def vpn_manager(_vpn_manager_template):
+    """A per-test copy of the template VPNManager (see copy_vpn_manager)"""
+    return copy_vpn_manager(_vpn_manager_template)
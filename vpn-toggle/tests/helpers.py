@@ -0,0 +1,24 @@
+"""
+Shared helpers for the test suite
+"""
+import copy
+import subprocess
+
+
+def done(returncode: int = 0, stdout: str = '', stderr: str = '') -> subprocess.CompletedProcess:
+    """Build the CompletedProcess a mocked subprocess.run hands back"""
+    return subprocess.CompletedProcess((), returncode, stdout, stderr)
+
+
+def copy_vpn_manager(template, config_manager=None):
+    """Copy a template VPNManager so a test can reassign its methods and state.
+
+    The backends are copied as well, so stubbing one never leaks back into the
+    template; pass config_manager to bind the copy to it.
+    """
+    manager = copy.copy(template)
+    manager._backends = {name: copy.copy(backend) for name, backend in template._backends.items()}
+    manager._discovered_backends = {}
+    if config_manager is not None:
+        manager._config_manager = config_manager
+    return manager
@@ -2,8 +2,11 @@
 Tests for Assert system
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, Mock
 import socket
+import subprocess
+
+import requests
 
 from vpn_toggle.asserts import (
     VPNAssert,
@@ -14,6 +17,17 @@ from vpn_toggle.asserts import (
     create_assert
 )
 
+from tests.helpers import done
+
+
+_DNS_PREFIX_CASES = [
+    ("100.64.1.5", "100.", True),
+    ("100.64.1.5", "100.64.", True),
+    ("100.64.1.5", "100.64.1.", True),
+    ("192.168.1.1", "10.", False),
+    ("10.8.0.2", "10.8", True),
+]
+
 
 class TestDNSLookupAssert:
     """Test suite for DNSLookupAssert"""
@@ -98,46 +112,46 @@ class TestDNSLookupAssert:
         assert result.success is False
         assert 'missing' in result.message.lower()
 
+    @pytest.mark.parametrize("ip,prefix,should_succeed", _DNS_PREFIX_CASES)
     @patch('socket.gethostbyname')
-    def test_dns_lookup_partial_prefix(self, mock_gethostbyname):
+    def test_dns_lookup_partial_prefix(self, mock_gethostbyname, ip, prefix, should_succeed):
         """Test DNS lookup with various partial prefix matches"""
-        test_cases = [
-            ("100.64.1.5", "100.", True),
-            ("100.64.1.5", "100.64.", True),
-            ("100.64.1.5", "100.64.1.", True),
-            ("192.168.1.1", "10.", False),
-            ("10.8.0.2", "10.8", True),
-        ]
-
-        for ip, prefix, should_succeed in test_cases:
-            mock_gethostbyname.return_value = ip
-            assert_config = {
-                'type': 'dns_lookup',
-                'hostname': 'test.example.com',
-                'expected_prefix': prefix
-            }
-            assert_obj = DNSLookupAssert(assert_config)
-            result = assert_obj.check()
+        mock_gethostbyname.return_value = ip
+        assert_config = {
+            'type': 'dns_lookup',
+            'hostname': 'test.example.com',
+            'expected_prefix': prefix
+        }
+        assert_obj = DNSLookupAssert(assert_config)
+        result = assert_obj.check()
 
-            assert result.success == should_succeed, \
-                f"Expected {should_succeed} for IP {ip} with prefix {prefix}"
+        assert result.success == should_succeed, \
+            f"Expected {should_succeed} for IP {ip} with prefix {prefix}"
 
 
 class TestGeolocationAssert:
     """Test suite for GeolocationAssert"""
 
+    @pytest.fixture
+    def geo_response_factory(self):
+        """Build a mocked ip-api.com response; kwargs override the payload"""
+        def _make(**overrides):
+            response = Mock(spec=requests.Response)
+            response.json.return_value = {
+                'status': 'success',
+                'city': 'Las Vegas',
+                'regionName': 'Nevada',
+                'country': 'United States',
+                'query': '1.2.3.4',
+                **overrides,
+            }
+            return response
+        return _make
+
     @patch('requests.get')
-    def test_geolocation_success_city_match(self, mock_get):
+    def test_geolocation_success_city_match(self, mock_get, geo_response_factory):
         """Test successful geolocation check with city match"""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'status': 'success',
-            'city': 'Las Vegas',
-            'regionName': 'Nevada',
-            'country': 'United States',
-            'query': '1.2.3.4'
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = geo_response_factory()
 
         assert_config = {
             'type': 'geolocation',
@@ -153,17 +167,9 @@ class TestGeolocationAssert:
         assert result.details['ip'] == '1.2.3.4'
 
     @patch('requests.get')
-    def test_geolocation_success_partial_match(self, mock_get):
+    def test_geolocation_success_partial_match(self, mock_get, geo_response_factory):
         """Test geolocation with partial/case-insensitive match"""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'status': 'success',
-            'city': 'Las Vegas',
-            'regionName': 'Nevada',
-            'country': 'United States',
-            'query': '1.2.3.4'
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = geo_response_factory()
 
         # Test case-insensitive match
         assert_config = {
@@ -184,17 +190,13 @@ class TestGeolocationAssert:
         assert result.success is True
 
     @patch('requests.get')
-    def test_geolocation_success_region_match(self, mock_get):
+    def test_geolocation_success_region_match(self, mock_get, geo_response_factory):
         """Test geolocation check with region field"""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'status': 'success',
-            'city': 'Los Angeles',
-            'regionName': 'California',
-            'country': 'United States',
-            'query': '5.6.7.8'
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = geo_response_factory(
+            city='Los Angeles',
+            regionName='California',
+            query='5.6.7.8',
+        )
 
         assert_config = {
             'type': 'geolocation',
@@ -208,17 +210,14 @@ class TestGeolocationAssert:
         assert result.details['actual'] == 'California'
 
     @patch('requests.get')
-    def test_geolocation_success_country_match(self, mock_get):
+    def test_geolocation_success_country_match(self, mock_get, geo_response_factory):
         """Test geolocation check with country field"""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'status': 'success',
-            'city': 'London',
-            'regionName': 'England',
-            'country': 'United Kingdom',
-            'query': '9.10.11.12'
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = geo_response_factory(
+            city='London',
+            regionName='England',
+            country='United Kingdom',
+            query='9.10.11.12',
+        )
 
         assert_config = {
             'type': 'geolocation',
@@ -232,17 +231,13 @@ class TestGeolocationAssert:
         assert result.details['actual'] == 'United Kingdom'
 
     @patch('requests.get')
-    def test_geolocation_failure_no_match(self, mock_get):
+    def test_geolocation_failure_no_match(self, mock_get, geo_response_factory):
         """Test geolocation failure when location doesn't match"""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'status': 'success',
-            'city': 'New York',
-            'regionName': 'New York',
-            'country': 'United States',
-            'query': '13.14.15.16'
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = geo_response_factory(
+            city='New York',
+            regionName='New York',
+            query='13.14.15.16',
+        )
 
         assert_config = {
             'type': 'geolocation',
@@ -258,14 +253,9 @@ class TestGeolocationAssert:
         assert result.details['expected'] == 'Las Vegas'
 
     @patch('requests.get')
-    def test_geolocation_api_error(self, mock_get):
+    def test_geolocation_api_error(self, mock_get, geo_response_factory):
         """Test geolocation when API returns an error"""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'status': 'fail',
-            'message': 'invalid query'
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = geo_response_factory(status='fail', message='invalid query')
 
         assert_config = {
             'type': 'geolocation',
@@ -281,7 +271,6 @@ class TestGeolocationAssert:
     @patch('requests.get')
     def test_geolocation_network_error(self, mock_get):
         """Test geolocation when network request fails"""
-        import requests
         mock_get.side_effect = requests.RequestException("Connection timeout")
 
         assert_config = {
@@ -309,17 +298,14 @@ class TestGeolocationAssert:
         assert 'missing' in result.message.lower()
 
     @patch('requests.get')
-    def test_geolocation_default_field(self, mock_get):
+    def test_geolocation_default_field(self, mock_get, geo_response_factory):
         """Test that geolocation defaults to 'city' field"""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'status': 'success',
-            'city': 'Paris',
-            'regionName': 'Île-de-France',
-            'country': 'France',
-            'query': '17.18.19.20'
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = geo_response_factory(
+            city='Paris',
+            regionName='Île-de-France',
+            country='France',
+            query='17.18.19.20',
+        )
 
         assert_config = {
             'type': 'geolocation',
@@ -334,17 +320,14 @@ class TestGeolocationAssert:
 
     @patch('requests.get')
     @patch('builtins.print')  # Mock print to verify location is printed
-    def test_geolocation_prints_detected_location(self, mock_print, mock_get):
+    def test_geolocation_prints_detected_location(self, mock_print, mock_get, geo_response_factory):
         """Test that geolocation prints detected location for user debugging"""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'status': 'success',
-            'city': 'Tokyo',
-            'regionName': 'Tokyo',
-            'country': 'Japan',
-            'query': '21.22.23.24'
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = geo_response_factory(
+            city='Tokyo',
+            regionName='Tokyo',
+            country='Japan',
+            query='21.22.23.24',
+        )
 
         assert_config = {
             'type': 'geolocation',
@@ -364,7 +347,7 @@ class TestPingAssert:
 
     @patch('subprocess.run')
     def test_ping_success(self, mock_run):
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = done(
             returncode=0,
             stdout='PING 172.16.0.1 (172.16.0.1) 56(84) bytes of data.\n'
                    '64 bytes from 172.16.0.1: icmp_seq=1 ttl=64 time=13.5 ms\n'
@@ -376,7 +359,7 @@ class TestPingAssert:
 
     @patch('subprocess.run')
     def test_ping_failure(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=1, stdout='', stderr='')
+        mock_run.return_value = done(returncode=1, stdout='', stderr='')
         assert_obj = PingAssert({'type': 'ping', 'host': '10.0.0.99'})
         result = assert_obj.check()
         assert result.success is False
@@ -384,7 +367,6 @@ class TestPingAssert:
 
     @patch('subprocess.run')
     def test_ping_timeout(self, mock_run):
-        import subprocess
         mock_run.side_effect = subprocess.TimeoutExpired(cmd='ping', timeout=5)
         assert_obj = PingAssert({'type': 'ping', 'host': '10.0.0.99', 'timeout_seconds': 5})
         result = assert_obj.check()
@@ -399,7 +381,7 @@ class TestPingAssert:
 
     @patch('subprocess.run')
     def test_ping_custom_timeout(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout='time=1.2 ms')
+        mock_run.return_value = done(returncode=0, stdout='time=1.2 ms')
         assert_obj = PingAssert({'type': 'ping', 'host': '1.1.1.1', 'timeout_seconds': 10})
         assert_obj.check()
         # Verify timeout was passed to ping command
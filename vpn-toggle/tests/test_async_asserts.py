@@ -7,9 +7,11 @@ that drive the `completed(AssertResult)` signal synchronously.
 """
 import time
 from typing import List
-from unittest.mock import MagicMock
 
 import pytest
+
+pytest.importorskip("PyQt6.QtCore", reason="PyQt6 is required for async assert tests")
+
 from PyQt6.QtCore import QCoreApplication, QTimer
 
 from vpn_toggle.asserts import (
@@ -2,18 +2,99 @@
 Tests for ConfigManager
 """
 import json
+import threading
+
 import pytest
-import tempfile
-from pathlib import Path
+from unittest.mock import patch
 
 from vpn_toggle.config import ConfigManager, DEFAULT_CONFIG
 
 
-@pytest.fixture
-def temp_config_file():
-    """Fixture to provide a unique temporary config file for each test"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir) / "test_config.json"
+def _noop(manager):
+    pass
+
+
+def _pick(settings, *keys):
+    return {key: settings[key] for key in keys}
+
+
+def _add_two_restore_vpns(manager):
+    manager.add_restore_vpn("vpn-1")
+    manager.add_restore_vpn("vpn-2")
+
+
+def _add_restore_vpn_twice(manager):
+    manager.add_restore_vpn("vpn-1")
+    manager.add_restore_vpn("vpn-1")
+
+
+def _add_two_remove_first(manager):
+    _add_two_restore_vpns(manager)
+    manager.remove_restore_vpn("vpn-1")
+
+
+_STARTUP_FLAGS = ('autostart', 'start_minimized', 'restore_connections')
+
+# (operation, read-back, expected) cases driven through the shared manager
+_STATE_CASES = [
+    pytest.param(
+        lambda m: m.update_window_geometry(100, 200, 800, 600),
+        lambda m: m.get_window_geometry(),
+        {'x': 100, 'y': 200, 'width': 800, 'height': 600},
+        id="update_window_geometry"),
+    pytest.param(
+        _noop,
+        lambda m: m.get_vpn_config('nonexistent_vpn'),
+        None,
+        id="get_vpn_config_nonexistent"),
+    pytest.param(
+        _noop,
+        lambda m: m.remove_vpn_config('nonexistent'),
+        False,
+        id="remove_vpn_config_nonexistent"),
+    pytest.param(
+        lambda m: m.update_monitor_settings(
+            enabled=True, check_interval_seconds=90, failure_threshold=5),
+        lambda m: _pick(m.get_monitor_settings(),
+                        'enabled', 'check_interval_seconds', 'failure_threshold'),
+        {'enabled': True, 'check_interval_seconds': 90, 'failure_threshold': 5},
+        id="update_monitor_settings"),
+    pytest.param(
+        _noop,
+        lambda m: _pick(m.get_startup_settings(), *_STARTUP_FLAGS),
+        {'autostart': False, 'start_minimized': False, 'restore_connections': False},
+        id="startup_defaults"),
+    pytest.param(
+        lambda m: m.update_startup_settings(autostart=True, start_minimized=True),
+        lambda m: _pick(m.get_startup_settings(), *_STARTUP_FLAGS),
+        {'autostart': True, 'start_minimized': True, 'restore_connections': False},
+        id="update_startup_settings"),
+    pytest.param(
+        _noop,
+        lambda m: m.get_restore_vpns(),
+        [],
+        id="restore_vpns_default_empty"),
+    pytest.param(
+        _add_two_restore_vpns,
+        lambda m: m.get_restore_vpns(),
+        ["vpn-1", "vpn-2"],
+        id="add_restore_vpn"),
+    pytest.param(
+        _add_restore_vpn_twice,
+        lambda m: m.get_restore_vpns(),
+        ["vpn-1"],
+        id="add_restore_vpn_no_duplicates"),
+    pytest.param(
+        _add_two_remove_first,
+        lambda m: m.get_restore_vpns(),
+        ["vpn-2"],
+        id="remove_restore_vpn"),
+    pytest.param(
+        lambda m: m.remove_restore_vpn("nonexistent"),
+        lambda m: m.get_restore_vpns(),
+        [],
+        id="remove_restore_vpn_not_present"),
+]
 
 
 class TestConfigManager:
@@ -30,39 +111,50 @@ class TestConfigManager:
         assert 'vpns' in config
         assert 'window' in config
         assert temp_config_file.exists()  # Should be created
+        assert json.loads(temp_config_file.read_bytes()) == DEFAULT_CONFIG
 
-    def test_save_and_load_config(self, temp_config_file):
-        """Test saving and loading config"""
-        manager = ConfigManager(str(temp_config_file))
+    def test_load_copied_default_config(self, default_config_file):
+        """Test that the shared default config template loads as DEFAULT_CONFIG"""
+        manager = ConfigManager(str(default_config_file))
+
+        assert manager.get_config() == DEFAULT_CONFIG
 
+    def test_save_and_load_config(self, config_manager):
+        """Test saving and loading config"""
         # Modify config
-        manager.config['monitor']['enabled'] = True
-        manager.config['monitor']['check_interval_seconds'] = 60
-        manager.save_config()
+        config_manager.config['monitor']['enabled'] = True
+        config_manager.config['monitor']['check_interval_seconds'] = 60
+        config_manager.save_config()
 
         # Create new manager to load saved config
-        manager2 = ConfigManager(str(temp_config_file))
+        manager2 = ConfigManager(str(config_manager.config_path))
         config = manager2.get_config()
 
         assert config['monitor']['enabled'] is True
         assert config['monitor']['check_interval_seconds'] == 60
 
-    def test_update_window_geometry(self, temp_config_file):
-        """Test updating window geometry"""
+    def test_save_and_load_without_orjson(self, temp_config_file, monkeypatch):
+        """Test the stdlib json fallback round-trips the same config"""
+        monkeypatch.setattr("vpn_toggle.config.orjson", None)
         manager = ConfigManager(str(temp_config_file))
+        manager.update_monitor_settings(enabled=True)
+
+        manager2 = ConfigManager(str(temp_config_file))
+        assert manager2.get_monitor_settings()['enabled'] is True
+        assert json.loads(temp_config_file.read_text())['monitor']['enabled'] is True
 
-        manager.update_window_geometry(100, 200, 800, 600)
+    def test_save_config_skips_unchanged(self, config_manager):
+        """Test that saving an unchanged config does not rewrite the file"""
+        with patch.object(config_manager, '_write_atomic') as mock_write:
+            config_manager.save_config()
+            mock_write.assert_not_called()
 
-        geometry = manager.get_window_geometry()
-        assert geometry['x'] == 100
-        assert geometry['y'] == 200
-        assert geometry['width'] == 800
-        assert geometry['height'] == 600
+            config_manager.config['monitor']['enabled'] = True
+            config_manager.save_config()
+            mock_write.assert_called_once()
 
-    def test_get_vpn_config_existing(self, temp_config_file):
+    def test_get_vpn_config_existing(self, config_manager):
         """Test retrieving VPN config that exists"""
-        manager = ConfigManager(str(temp_config_file))
-
         # Add a VPN
         vpn_config = {
             'name': 'test_vpn',
@@ -70,25 +162,48 @@ class TestConfigManager:
             'enabled': True,
             'asserts': []
         }
-        manager.update_vpn_config('test_vpn', vpn_config)
+        config_manager.update_vpn_config('test_vpn', vpn_config)
 
         # Retrieve it
-        retrieved = manager.get_vpn_config('test_vpn')
+        retrieved = config_manager.get_vpn_config('test_vpn')
         assert retrieved is not None
         assert retrieved['name'] == 'test_vpn'
         assert retrieved['display_name'] == 'Test VPN'
 
-    def test_get_vpn_config_nonexistent(self, temp_config_file):
-        """Test retrieving VPN config that doesn't exist"""
-        manager = ConfigManager(str(temp_config_file))
+    def test_get_vpn_config_is_read_only(self, config_manager):
+        """Test that returned VPN configs are read-only views"""
+        config_manager.update_vpn_config('test_vpn', {'name': 'test_vpn', 'enabled': True})
 
-        retrieved = manager.get_vpn_config('nonexistent_vpn')
-        assert retrieved is None
+        retrieved = config_manager.get_vpn_config('test_vpn')
+        with pytest.raises(TypeError):
+            retrieved['enabled'] = False
+        with pytest.raises(TypeError):
+            config_manager.get_all_vpns()[0]['enabled'] = False
 
-    def test_update_vpn_config_new(self, temp_config_file):
-        """Test adding a new VPN config"""
-        manager = ConfigManager(str(temp_config_file))
+        assert config_manager.get_vpn_config('test_vpn')['enabled'] is True
 
+    def test_get_vpn_config_nested_read_only(self, config_manager):
+        """Test that nested asserts can't be mutated through the returned view"""
+        config_manager.update_vpn_config('test_vpn', {
+            'name': 'test_vpn',
+            'asserts': [{'type': 'ping', 'host': '10.0.0.1'}],
+        })
+
+        asserts = config_manager.get_vpn_config('test_vpn')['asserts']
+        with pytest.raises(AttributeError):
+            asserts.append({'type': 'ping'})
+        with pytest.raises(TypeError):
+            asserts[0]['host'] = '10.0.0.2'
+
+        # A modified copy of the frozen view round-trips through update and save
+        vpn = config_manager.get_vpn_config('test_vpn')
+        config_manager.update_vpn_config('test_vpn', {**vpn, 'enabled': False})
+        reloaded = ConfigManager(str(config_manager.config_path))
+        assert reloaded.get_vpn_config('test_vpn')['asserts'] == (
+            {'type': 'ping', 'host': '10.0.0.1'},)
+
+    def test_update_vpn_config_new(self, config_manager):
+        """Test adding a new VPN config"""
         vpn_config = {
             'name': 'new_vpn',
             'display_name': 'New VPN',
@@ -97,71 +212,72 @@ class TestConfigManager:
                 {'type': 'dns_lookup', 'hostname': 'example.com', 'expected_prefix': '1.2.'}
             ]
         }
-        manager.update_vpn_config('new_vpn', vpn_config)
+        config_manager.update_vpn_config('new_vpn', vpn_config)
 
-        all_vpns = manager.get_all_vpns()
+        all_vpns = config_manager.get_all_vpns()
         assert len(all_vpns) == 1
         assert all_vpns[0]['name'] == 'new_vpn'
 
-    def test_update_vpn_config_existing(self, temp_config_file):
+    def test_update_vpn_config_existing(self, config_manager):
         """Test updating an existing VPN config"""
-        manager = ConfigManager(str(temp_config_file))
-
         # Add initial VPN
         vpn_config = {'name': 'vpn1', 'display_name': 'VPN One', 'enabled': True, 'asserts': []}
-        manager.update_vpn_config('vpn1', vpn_config)
+        config_manager.update_vpn_config('vpn1', vpn_config)
 
         # Update it
         updated_config = {'name': 'vpn1', 'display_name': 'VPN One Updated', 'enabled': False, 'asserts': []}
-        manager.update_vpn_config('vpn1', updated_config)
+        config_manager.update_vpn_config('vpn1', updated_config)
 
-        all_vpns = manager.get_all_vpns()
+        all_vpns = config_manager.get_all_vpns()
         assert len(all_vpns) == 1
         assert all_vpns[0]['display_name'] == 'VPN One Updated'
         assert all_vpns[0]['enabled'] is False
 
-    def test_remove_vpn_config(self, temp_config_file):
-        """Test removing a VPN config"""
-        manager = ConfigManager(str(temp_config_file))
+    def test_update_vpn_config_copy_on_write(self, config_manager):
+        """Test that updates publish a new vpns list instead of mutating the old one"""
+        config_manager.update_vpn_config('vpn1', {'name': 'vpn1', 'display_name': 'VPN 1'})
+        snapshot = config_manager.config['vpns']
+
+        config_manager.update_vpn_config('vpn2', {'name': 'vpn2', 'display_name': 'VPN 2'})
+
+        assert [vpn['name'] for vpn in snapshot] == ['vpn1']
+        assert len(config_manager.get_all_vpns()) == 2
 
+    def test_remove_vpn_config(self, config_manager):
+        """Test removing a VPN config"""
         # Add VPNs
-        manager.update_vpn_config('vpn1', {'name': 'vpn1', 'display_name': 'VPN 1'})
-        manager.update_vpn_config('vpn2', {'name': 'vpn2', 'display_name': 'VPN 2'})
+        config_manager.update_vpn_config('vpn1', {'name': 'vpn1', 'display_name': 'VPN 1'})
+        config_manager.update_vpn_config('vpn2', {'name': 'vpn2', 'display_name': 'VPN 2'})
 
         # Remove one
-        result = manager.remove_vpn_config('vpn1')
+        result = config_manager.remove_vpn_config('vpn1')
         assert result is True
 
-        all_vpns = manager.get_all_vpns()
+        all_vpns = config_manager.get_all_vpns()
         assert len(all_vpns) == 1
         assert all_vpns[0]['name'] == 'vpn2'
 
-    def test_remove_vpn_config_nonexistent(self, temp_config_file):
-        """Test removing a VPN that doesn't exist"""
-        manager = ConfigManager(str(temp_config_file))
-
-        result = manager.remove_vpn_config('nonexistent')
-        assert result is False
+    @pytest.mark.parametrize("operation,read,expected", _STATE_CASES)
+    def test_state_transitions(self, config_manager, operation, read, expected):
+        """Test single-field updates and defaults through the shared manager"""
+        operation(config_manager)
+        assert read(config_manager) == expected
 
-    def test_update_monitor_settings(self, temp_config_file):
-        """Test updating monitor settings"""
-        manager = ConfigManager(str(temp_config_file))
+    def test_save_is_atomic(self, config_manager):
+        """Test that a failed save leaves the previous file and no temp file"""
+        before = config_manager.config_path.read_bytes()
+        config_manager.config['monitor']['enabled'] = True
 
-        manager.update_monitor_settings(
-            enabled=True,
-            check_interval_seconds=90,
-            failure_threshold=5
-        )
+        with patch('vpn_toggle.config.os.replace', side_effect=OSError("disk full")):
+            config_manager.save_config()
 
-        settings = manager.get_monitor_settings()
-        assert settings['enabled'] is True
-        assert settings['check_interval_seconds'] == 90
-        assert settings['failure_threshold'] == 5
+        assert config_manager.config_path.read_bytes() == before
+        assert list(config_manager.config_path.parent.glob('*.tmp')) == []
 
     def test_invalid_json_fallback(self, temp_config_file):
         """Test fallback to defaults on corrupted JSON"""
         # Write invalid JSON
-        temp_config_file.write_text("{invalid json")
+        temp_config_file.write_bytes(b"{invalid json")
 
         manager = ConfigManager(str(temp_config_file))
         config = manager.get_config()
@@ -181,7 +297,7 @@ class TestConfigManager:
             }
             # Missing vpns, window, logging
         }
-        temp_config_file.write_text(json.dumps(partial_config))
+        temp_config_file.write_bytes(json.dumps(partial_config).encode())
 
         manager = ConfigManager(str(temp_config_file))
         config = manager.get_config()
@@ -193,91 +309,81 @@ class TestConfigManager:
         assert 'window' in config
         assert 'logging' in config
 
-    def test_startup_defaults(self, temp_config_file):
-        """Test that startup config has correct defaults"""
+    def test_merge_does_not_alias_mutable_defaults(self, temp_config_file):
+        """Test that updates after a merge never leak into DEFAULT_CONFIG"""
+        temp_config_file.write_bytes(json.dumps({"startup": {"autostart": True}}).encode())
         manager = ConfigManager(str(temp_config_file))
 
-        startup = manager.get_startup_settings()
-        assert startup['autostart'] is False
-        assert startup['start_minimized'] is False
-        assert startup['restore_connections'] is False
+        manager.add_restore_vpn("vpn-1")
+        manager.update_vpn_config("vpn-1", {"name": "vpn-1"})
+        manager.update_window_geometry(1, 2, 3, 4)
 
-    def test_update_startup_settings(self, temp_config_file):
-        """Test updating startup settings"""
-        manager = ConfigManager(str(temp_config_file))
+        assert DEFAULT_CONFIG["startup"]["restore_vpns"] == []
+        assert DEFAULT_CONFIG["vpns"] == []
+        assert DEFAULT_CONFIG["window"]["geometry"]["x"] is None
 
-        manager.update_startup_settings(autostart=True, start_minimized=True)
+    def test_startup_config_persists(self, config_manager):
+        """Test that startup config persists across loads"""
+        config_manager.update_startup_settings(autostart=True, restore_connections=True)
+        config_manager.add_restore_vpn("vpn-1")
 
-        startup = manager.get_startup_settings()
+        manager2 = ConfigManager(str(config_manager.config_path))
+        startup = manager2.get_startup_settings()
         assert startup['autostart'] is True
-        assert startup['start_minimized'] is True
-        assert startup['restore_connections'] is False
-
-    def test_get_restore_vpns_default_empty(self, temp_config_file):
-        """Test that restore VPN list is empty by default"""
-        manager = ConfigManager(str(temp_config_file))
+        assert startup['restore_connections'] is True
+        assert manager2.get_restore_vpns() == ["vpn-1"]
 
-        assert manager.get_restore_vpns() == []
+    def test_autosave_coalesces_writes(self, temp_config_file):
+        """Test that autosave batches many updates into one deferred write"""
+        manager = ConfigManager(str(temp_config_file), autosave=True)
 
-    def test_add_restore_vpn(self, temp_config_file):
-        """Test adding a VPN to the restore list"""
-        manager = ConfigManager(str(temp_config_file))
+        with patch.object(manager, 'save_config', wraps=manager.save_config) as mock_save:
+            for i in range(20):
+                manager.update_monitor_settings(check_interval_seconds=i)
+            assert mock_save.call_count == 0
 
-        manager.add_restore_vpn("vpn-1")
-        manager.add_restore_vpn("vpn-2")
+            manager.flush()
+            assert mock_save.call_count == 1
 
-        assert manager.get_restore_vpns() == ["vpn-1", "vpn-2"]
+        reloaded = ConfigManager(str(temp_config_file))
+        assert reloaded.get_monitor_settings()['check_interval_seconds'] == 19
 
-    def test_add_restore_vpn_no_duplicates(self, temp_config_file):
-        """Test that adding a duplicate VPN does not create duplicates"""
-        manager = ConfigManager(str(temp_config_file))
+    def test_autosave_notifies_owner(self, temp_config_file):
+        """Test that autosave defers the write to the owner via on_dirty"""
+        manager = ConfigManager(str(temp_config_file), autosave=True)
+        notified = []
+        manager.on_dirty = lambda: notified.append(True)
 
+        manager.update_monitor_settings(enabled=True)
         manager.add_restore_vpn("vpn-1")
-        manager.add_restore_vpn("vpn-1")
-
-        assert manager.get_restore_vpns() == ["vpn-1"]
+        assert len(notified) == 2
+        assert json.loads(temp_config_file.read_bytes())['monitor']['enabled'] is False
 
-    def test_remove_restore_vpn(self, temp_config_file):
-        """Test removing a VPN from the restore list"""
-        manager = ConfigManager(str(temp_config_file))
-
-        manager.add_restore_vpn("vpn-1")
-        manager.add_restore_vpn("vpn-2")
-        manager.remove_restore_vpn("vpn-1")
+        manager.flush()
+        assert json.loads(temp_config_file.read_bytes())['monitor']['enabled'] is True
 
-        assert manager.get_restore_vpns() == ["vpn-2"]
+    def test_save_fsyncs_when_enabled(self, temp_config_file, monkeypatch):
+        """Test that saves fsync the temp file unless FSYNC_ON_SAVE is off"""
+        synced = []
+        monkeypatch.setattr("vpn_toggle.config.os.fsync", synced.append)
+        monkeypatch.setattr(ConfigManager, "FSYNC_ON_SAVE", True)
 
-    def test_remove_restore_vpn_not_present(self, temp_config_file):
-        """Test removing a VPN that is not in the restore list"""
         manager = ConfigManager(str(temp_config_file))
+        manager.update_monitor_settings(enabled=True)
+        assert len(synced) == 2  # initial default write + the update
 
-        manager.remove_restore_vpn("nonexistent")
-        assert manager.get_restore_vpns() == []
+        monkeypatch.setattr(ConfigManager, "FSYNC_ON_SAVE", False)
+        manager.update_monitor_settings(enabled=False)
+        assert len(synced) == 2
 
-    def test_startup_config_persists(self, temp_config_file):
-        """Test that startup config persists across loads"""
-        manager = ConfigManager(str(temp_config_file))
-        manager.update_startup_settings(autostart=True, restore_connections=True)
-        manager.add_restore_vpn("vpn-1")
-
-        manager2 = ConfigManager(str(temp_config_file))
-        startup = manager2.get_startup_settings()
-        assert startup['autostart'] is True
-        assert startup['restore_connections'] is True
-        assert manager2.get_restore_vpns() == ["vpn-1"]
-
-    def test_thread_safety(self, temp_config_file):
+    def test_thread_safety(self, config_manager):
         """Test that ConfigManager is thread-safe"""
-        import threading
-
-        manager = ConfigManager(str(temp_config_file))
-
         errors = []
 
         def update_config(vpn_name):
             try:
                 for i in range(10):
-                    manager.update_vpn_config(vpn_name, {
+                    config_manager.update_vpn_config(vpn_name, {
                         'name': vpn_name,
                         'display_name': f'{vpn_name}_{i}'
                     })
@@ -295,5 +401,5 @@ class TestConfigManager:
             t.join()
 
         assert len(errors) == 0
-        all_vpns = manager.get_all_vpns()
+        all_vpns = config_manager.get_all_vpns()
         assert len(all_vpns) == 5
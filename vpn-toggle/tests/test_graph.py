@@ -4,32 +4,24 @@ Tests for MetricsGraphWidget data handling.
 These tests verify the graph widget's data management logic (series creation,
 data point addition, clear). Rendering is not tested — that's verified manually.
 """
+from datetime import datetime
+
 import pytest
-import tempfile
-from pathlib import Path
-from unittest.mock import patch, MagicMock
 
-from PyQt6.QtWidgets import QApplication
+pytest.importorskip("PyQt6.QtWidgets", reason="PyQt6 is required for GUI tests")
+pytest.importorskip("pyqtgraph", reason="pyqtgraph is required for graph tests")
+
+from PyQt6.QtWidgets import QGraphicsItem
 
 import pyqtgraph as pg
 
 from vpn_toggle.metrics import MetricsCollector, DataPoint, AssertDetail
-from vpn_toggle.graph import MetricsGraphWidget, VPN_COLORS
-
-
-@pytest.fixture(scope="session")
-def qapp():
-    """Session-scoped QApplication for all graph tests."""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    return app
+from vpn_toggle.graph import MetricsGraphWidget, VPN_COLORS, _iso_to_epoch
 
 
 @pytest.fixture
-def metrics_dir():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir) / "metrics"
+def metrics_dir(tmp_path):
+    return tmp_path / "metrics"
 
 
 @pytest.fixture
@@ -38,8 +30,9 @@ def collector(metrics_dir):
 
 
 @pytest.fixture
-def graph_widget(qapp, collector):
+def graph_widget(qtbot, collector):
     widget = MetricsGraphWidget(collector)
+    qtbot.addWidget(widget)
     return widget
 
 
@@ -79,7 +72,23 @@ class TestSeriesCreation:
         graph_widget._ensure_vpn_series("vpn-a")
         graph_widget._ensure_vpn_series("vpn-b")
 
-        assert graph_widget._color_index == 2
+        color_a = graph_widget._vpn_lines["vpn-a"].opts['pen'].color().name()
+        color_b = graph_widget._vpn_lines["vpn-b"].opts['pen'].color().name()
+        assert color_a != color_b
+
+    def test_vpn_color_is_stable(self, graph_widget):
+        color = graph_widget._vpn_color("vpn-a")
+        assert color in VPN_COLORS
+        assert graph_widget._vpn_color("vpn-a") == color
+
+    def test_colliding_names_get_distinct_colors(self, graph_widget):
+        # Every name lands on a free color until the palette runs out
+        names = [f"vpn-{i}" for i in range(len(VPN_COLORS))]
+        for name in names:
+            graph_widget._ensure_vpn_series(name)
+
+        colors = [graph_widget._vpn_lines[name].opts['pen'].color().name() for name in names]
+        assert sorted(colors) == sorted(VPN_COLORS)
 
 
 class TestDataPointAddition:
@@ -111,6 +120,43 @@ class TestDataPointAddition:
         assert len(graph_widget._bounce_items) >= 2
 
 
+    def test_add_data_points_bulk(self, graph_widget):
+        points = [
+            _make_point(vpn="vpn-a", timestamp="2026-02-12T14:00:00"),
+            _make_point(vpn="vpn-b", timestamp="2026-02-12T14:00:00"),
+            _make_point(vpn="vpn-a", success=False, timestamp="2026-02-12T14:02:00"),
+        ]
+        graph_widget.add_data_points(points)
+
+        x_a, y_a = graph_widget._vpn_lines["vpn-a"].getData()
+        assert len(x_a) == 2
+        assert x_a[0] < x_a[1]
+        fail_x, _ = graph_widget._vpn_fail_scatter["vpn-a"].getData()
+        assert len(fail_x) == 1
+        x_b, _ = graph_widget._vpn_lines["vpn-b"].getData()
+        assert len(x_b) == 1
+
+    def test_add_data_point_appends_to_series(self, graph_widget):
+        graph_widget.add_data_point(_make_point(timestamp="2026-02-12T14:00:00"))
+        graph_widget.add_data_point(_make_point(timestamp="2026-02-12T14:02:00"))
+
+        x_data, _ = graph_widget._vpn_lines["test-vpn"].getData()
+        assert len(x_data) == 2
+
+
+class TestItemCache:
+
+    def test_enable_item_cache_sets_device_coordinate_cache(self, graph_widget, collector):
+        point = _make_point()
+        collector.record(point)
+        graph_widget.add_data_point(point)
+
+        graph_widget.enable_item_cache()
+
+        line = graph_widget._vpn_lines["test-vpn"]
+        assert line.curve.cacheMode() == QGraphicsItem.CacheMode.DeviceCoordinateCache
+
+
 class TestClear:
 
     def test_clear_all_removes_series(self, graph_widget, collector):
@@ -126,7 +172,6 @@ class TestClear:
         assert graph_widget._vpn_pass_scatter == {}
         assert graph_widget._vpn_fail_scatter == {}
         assert graph_widget._bounce_items == []
-        assert graph_widget._color_index == 0
 
     def test_clear_all_clears_collector(self, graph_widget, collector):
         collector.record(_make_point())
@@ -139,7 +184,7 @@ class TestClear:
 
 class TestHistoricalDataLoad:
 
-    def test_loads_existing_data_on_init(self, qapp, metrics_dir):
+    def test_loads_existing_data_on_init(self, qtbot, metrics_dir):
         # Pre-populate collector with data
         collector = MetricsCollector(metrics_dir=metrics_dir)
         collector.record(_make_point(vpn="historical-vpn", timestamp="2026-02-12T10:00:00"))
@@ -147,6 +192,7 @@ class TestHistoricalDataLoad:
 
         # Create new widget — should auto-load historical data
         widget = MetricsGraphWidget(collector)
+        qtbot.addWidget(widget)
 
         assert "historical-vpn" in widget._vpn_lines
 
@@ -171,6 +217,11 @@ class TestDateAxisItem:
         x_data, _ = line.getData()
 
         # X values should be epoch timestamps (large numbers), not small offsets
-        from datetime import datetime
         expected_first = datetime.fromisoformat("2026-02-12T14:00:00").timestamp()
         assert abs(x_data[0] - expected_first) < 1.0
+
+    def test_iso_to_epoch_matches_fromisoformat(self):
+        """Cached conversion returns the same epoch as an uncached parse."""
+        ts = "2026-02-12T14:00:00"
+        assert _iso_to_epoch(ts) == datetime.fromisoformat(ts).timestamp()
+        assert _iso_to_epoch(ts) == _iso_to_epoch(ts)
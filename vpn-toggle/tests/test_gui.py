@@ -1,14 +1,21 @@
 """
 Tests for GUI components
 """
+import json
+import os
 import pytest
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch, call
-import tempfile
+from unittest.mock import Mock, patch
 from pathlib import Path
+from types import SimpleNamespace
 
+pytest.importorskip("PyQt6.QtWidgets", reason="PyQt6 is required for GUI tests")
+
+from PyQt6.QtGui import QCloseEvent
 from PyQt6.QtWidgets import QApplication, QSystemTrayIcon
-from PyQt6.QtGui import QIcon
 from PyQt6.QtNetwork import QLocalServer, QLocalSocket
 
 from vpn_toggle.config import ConfigManager
@@ -16,81 +23,90 @@ from vpn_toggle.gui import VPNToggleMainWindow
 from vpn_toggle.widgets import VPNWidget
 from vpn_toggle.dialogs import SettingsDialog
 
-
-@pytest.fixture(scope="session")
-def qapp():
-    """Create a QApplication instance for the test session"""
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication([])
-    return app
+from tests.helpers import copy_vpn_manager
 
 
-@pytest.fixture
-def temp_config_file():
-    """Fixture to provide a unique temporary config file for each test"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir) / "test_config.json"
+@pytest.fixture(autouse=True, scope="module")
+def _patch_subprocess():
+    """Keep window and widget code from shelling out to nmcli for the whole module"""
+    with patch('subprocess.run',
+               return_value=SimpleNamespace(returncode=0, stdout='/usr/bin/nmcli\n',
+                                            stderr='')) as mock_run:
+        yield mock_run
 
 
 @pytest.fixture
-def config_manager(temp_config_file):
-    """Fixture to provide a ConfigManager instance"""
-    with patch('subprocess.run'):
-        return ConfigManager(str(temp_config_file))
+def main_window(qtbot, config_manager, vpn_manager):
+    """Fixture to provide a VPNToggleMainWindow instance (closed by qtbot)"""
+    vpn_manager.list_vpns = lambda: []
+    window = VPNToggleMainWindow(config_manager, vpn_manager)
+    qtbot.addWidget(window)
+    return window
 
 
-@pytest.fixture
-def vpn_manager(config_manager):
-    """Fixture to provide a mocked VPNManager instance"""
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/nmcli\n')
-        from vpn_toggle.vpn_manager import VPNManager
-        return VPNManager(config_manager=config_manager)
+def _reset_log(window):
+    """Empty the activity log and re-apply the current MAX_LOG_LINES limit"""
+    window._log_flush_timer.stop()
+    window._log_buffer = deque(maxlen=window.MAX_LOG_LINES)
+    window.log_text.setMaximumBlockCount(window.MAX_LOG_LINES)
+    window.log_text.clear()
 
 
-@pytest.fixture
-def main_window(qapp, config_manager, vpn_manager):
-    """Fixture to provide a VPNToggleMainWindow instance"""
-    with patch.object(vpn_manager, 'list_vpns', return_value=[]):
-        window = VPNToggleMainWindow(config_manager, vpn_manager)
+class TestAppendLog:
+    """Test suite for activity log line limiting"""
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def _log_window(cls, qapp, _session_manager, _vpn_manager_template):
+        """One main window built once and shared by the tests in this class"""
+        vm = copy_vpn_manager(_vpn_manager_template, _session_manager)
+        vm.list_vpns = lambda: []
+        window = VPNToggleMainWindow(_session_manager, vm)
         yield window
         window.close()
 
+    @pytest.fixture
+    def main_window(self, _log_window):
+        """The shared window with an empty activity log"""
+        _reset_log(_log_window)
+        return _log_window
 
-class TestAppendLog:
-    """Test suite for activity log line limiting"""
+    @pytest.fixture
+    def small_log_limit(self, monkeypatch, main_window):
+        """Shrink MAX_LOG_LINES so pruning tests stay cheap"""
+        monkeypatch.setattr(VPNToggleMainWindow, "MAX_LOG_LINES", 50)
+        _reset_log(main_window)
 
     def test_append_log_adds_message(self, main_window):
         """Test that append_log adds a timestamped message"""
         main_window.append_log("test message")
+        main_window._flush_log()
         text = main_window.log_text.toPlainText()
         assert "test message" in text
 
     def test_append_log_includes_timestamp(self, main_window):
         """Test that log entries include a timestamp"""
         main_window.append_log("hello")
+        main_window._flush_log()
         text = main_window.log_text.toPlainText()
         # Timestamp format: [HH:MM:SS]
         assert "[" in text and "]" in text
 
-    def test_append_log_respects_max_lines(self, main_window):
+    def test_append_log_respects_max_lines(self, small_log_limit, main_window):
         """Test that log is pruned when exceeding MAX_LOG_LINES"""
         max_lines = VPNToggleMainWindow.MAX_LOG_LINES
 
         # Add more lines than the limit
-        for i in range(max_lines + 100):
-            main_window.append_log(f"line {i}")
+        main_window.append_log_bulk([f"line {i}" for i in range(max_lines + 100)])
 
         doc = main_window.log_text.document()
         assert doc.blockCount() <= max_lines
 
-    def test_append_log_preserves_recent_lines(self, main_window):
+    def test_append_log_preserves_recent_lines(self, small_log_limit, main_window):
         """Test that pruning keeps the most recent lines"""
         max_lines = VPNToggleMainWindow.MAX_LOG_LINES
 
-        for i in range(max_lines + 50):
-            main_window.append_log(f"msg-{i}")
+        main_window.append_log_bulk([f"msg-{i}" for i in range(max_lines + 50)])
 
         text = main_window.log_text.toPlainText()
         # The most recent message should still be present
@@ -98,10 +114,53 @@ class TestAppendLog:
         # The oldest messages should be gone
         assert "msg-0" not in text
 
+    def test_append_log_defers_render(self, main_window):
+        """Test that append_log buffers lines until the flush timer fires"""
+        main_window.append_log("pending")
+        assert "pending" not in main_window.log_text.toPlainText()
+        assert main_window._log_flush_timer.isActive()
+
+        main_window._flush_log()
+        assert "pending" in main_window.log_text.toPlainText()
+        assert not main_window._log_flush_timer.isActive()
+
+    def test_append_log_buffer_is_bounded(self, small_log_limit, main_window):
+        """Test that single appends beyond MAX_LOG_LINES drop the oldest lines"""
+        max_lines = VPNToggleMainWindow.MAX_LOG_LINES
+
+        for i in range(max_lines + 10):
+            main_window.append_log(f"entry-{i}")
+        main_window._flush_log()
+
+        lines = main_window.log_text.toPlainText().splitlines()
+        assert len(lines) == max_lines
+        assert lines[0].endswith("entry-10")
+
+    def test_flush_appends_only_new_lines(self, main_window):
+        """Test that each flush adds just the queued lines and empties the queue"""
+        main_window.append_log("one")
+        main_window._flush_log()
+        main_window.append_log("two")
+        main_window._flush_log()
+        main_window._flush_log()
+
+        lines = main_window.log_text.toPlainText().splitlines()
+        assert [line.split("] ", 1)[1] for line in lines] == ["one", "two"]
+        assert len(main_window._log_buffer) == 0
+
+    def test_append_log_bulk_keeps_existing_lines(self, main_window):
+        """Test that a bulk append follows lines added one at a time"""
+        main_window.append_log("first")
+        main_window.append_log_bulk(["second", "third"])
+
+        lines = main_window.log_text.toPlainText().splitlines()
+        assert [line.split("] ", 1)[1] for line in lines] == ["first", "second", "third"]
+
     def test_append_log_does_not_prune_under_limit(self, main_window):
         """Test that no pruning occurs when under the limit"""
         for i in range(10):
             main_window.append_log(f"line {i}")
+        main_window._flush_log()
 
         doc = main_window.log_text.document()
         # blockCount includes an initial empty block, so we check content
@@ -119,18 +178,34 @@ class TestAppendLog:
 class TestConnectionTime:
     """Test suite for VPN connection time counter."""
 
+    NOW = 1_000_000
+
+    @pytest.fixture(autouse=True)
+    def frozen_clock(self, monkeypatch):
+        """Pin the widget clock so elapsed times can't tick over mid-test."""
+        monkeypatch.setattr("vpn_toggle.widgets._now_seconds", lambda: self.NOW)
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def _pooled_widget(cls, qapp, _session_manager, _vpn_manager_template):
+        """One VPNWidget shared by the tests in this class.
+
+        Everything it is wired to lives at least as long as the class: the
+        session ConfigManager and a class-owned, stubbed copy of the VPNManager.
+        """
+        vm = copy_vpn_manager(_vpn_manager_template, _session_manager)
+        vm.is_vpn_active = lambda name: False
+        vm.get_connection_timestamp = lambda name: None
+        widget = VPNWidget("test-vpn", "Test VPN", vm, _session_manager)
+        yield widget
+        widget.close()
+
     @pytest.fixture
-    def vpn_widget(self, qapp, config_manager):
-        """Create a VPNWidget with mocked VPN manager."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/nmcli\n')
-            from vpn_toggle.vpn_manager import VPNManager
-            vm = VPNManager()
-
-        with patch.object(vm, 'is_vpn_active', return_value=False):
-            with patch.object(vm, 'get_connection_timestamp', return_value=None):
-                widget = VPNWidget("test-vpn", "Test VPN", vm, config_manager)
-        return widget
+    def vpn_widget(self, _pooled_widget):
+        """The pooled VPNWidget with its timer state reset."""
+        _pooled_widget._connected_since_monotonic = None
+        _pooled_widget.update_connection_time()
+        return _pooled_widget
 
     def test_connection_time_label_exists(self, vpn_widget):
         """VPN widget has a connection time label."""
@@ -139,8 +214,9 @@ class TestConnectionTime:
 
     def test_connection_time_shows_elapsed(self, vpn_widget):
         """Connection time label shows DD:HH:MM:SS format when connected."""
-        vpn_widget._connected_since = datetime.now() - timedelta(
-            days=1, hours=2, minutes=33, seconds=45
+        elapsed = timedelta(days=1, hours=2, minutes=33, seconds=45)
+        vpn_widget._connected_since_monotonic = (
+            self.NOW - int(elapsed.total_seconds())
         )
         vpn_widget.update_connection_time()
 
@@ -148,18 +224,37 @@ class TestConnectionTime:
         assert text == "01:02:33:45"
 
     def test_connection_time_clears_when_disconnected(self, vpn_widget):
-        """Connection time clears when _connected_since is None."""
-        vpn_widget._connected_since = datetime.now() - timedelta(hours=1)
+        """Connection time clears when _connected_since_monotonic is None."""
+        vpn_widget._connected_since_monotonic = self.NOW - 3600
         vpn_widget.update_connection_time()
         assert vpn_widget.connection_time_label.text() != ""
 
-        vpn_widget._connected_since = None
+        vpn_widget._connected_since_monotonic = None
         vpn_widget.update_connection_time()
         assert vpn_widget.connection_time_label.text() == ""
 
+    def test_connection_start_from_backend_timestamp(self, qtbot, config_manager, vpn_manager):
+        """Connection start reported by the backend is converted to monotonic time."""
+        vm = vpn_manager
+        started = datetime.now() - timedelta(minutes=5)
+
+        vm.is_vpn_active = lambda name: True
+        vm.get_connection_timestamp = lambda name: started
+        widget = VPNWidget("test-vpn", "Test VPN", vm, config_manager)
+        qtbot.addWidget(widget)
+
+        assert widget.connection_time_label.text() in ("00:00:05:00", "00:00:05:01")
+
+    def test_connection_time_over_99_days(self, vpn_widget):
+        """Day counts beyond the zero-pad table are shown in full."""
+        vpn_widget._connected_since_monotonic = self.NOW - 123 * 86400
+        vpn_widget.update_connection_time()
+
+        assert vpn_widget.connection_time_label.text() == "123:00:00:00"
+
     def test_connection_time_zero(self, vpn_widget):
         """Fresh connection shows 00:00:00:00."""
-        vpn_widget._connected_since = datetime.now()
+        vpn_widget._connected_since_monotonic = self.NOW
         vpn_widget.update_connection_time()
 
         text = vpn_widget.connection_time_label.text()
@@ -184,7 +279,7 @@ class TestSystemTray:
 
     def test_quit_application_stops_monitor(self, main_window):
         """quit_application stops the monitor thread."""
-        mock_thread = MagicMock()
+        mock_thread = Mock()
         mock_thread.isRunning.return_value = True
         main_window.monitor_thread = mock_thread
 
@@ -199,7 +294,6 @@ class TestSystemTray:
         main_window.tray._available = True
         main_window._quitting = False
 
-        from PyQt6.QtGui import QCloseEvent
         event = QCloseEvent()
         main_window.closeEvent(event)
 
@@ -210,10 +304,9 @@ class TestSystemTray:
         """Close event accepts (quits) when no tray is available."""
         main_window.tray._available = False
         main_window._quitting = False
-        main_window.monitor_thread = MagicMock()
+        main_window.monitor_thread = Mock()
         main_window.monitor_thread.isRunning.return_value = False
 
-        from PyQt6.QtGui import QCloseEvent
         event = QCloseEvent()
         main_window.closeEvent(event)
 
@@ -223,11 +316,10 @@ class TestSystemTray:
         """Close event accepts when _quitting flag is set."""
         main_window.tray._available = True
         main_window._quitting = True
-        main_window.monitor_thread = MagicMock()
+        main_window.monitor_thread = Mock()
         main_window.monitor_thread.isRunning.return_value = False
-        main_window.tray.tray_icon = MagicMock()
+        main_window.tray.tray_icon = Mock()
 
-        from PyQt6.QtGui import QCloseEvent
         event = QCloseEvent()
         main_window.closeEvent(event)
 
@@ -237,74 +329,65 @@ class TestSystemTray:
 class TestAutostart:
     """Test suite for autostart desktop file management."""
 
-    def test_create_autostart_file(self, qapp, config_manager):
+    @pytest.fixture(scope="class")
+    @classmethod
+    def _settings_dialog(cls, qapp, _session_manager):
+        """One SettingsDialog built once and shared by the tests in this class."""
+        dialog = SettingsDialog(_session_manager)
+        yield dialog
+        dialog.close()
+
+    @pytest.fixture
+    def settings_dialog(self, _settings_dialog, tmp_path):
+        """The shared dialog with checkboxes cleared and autostart paths in tmp_path."""
+        _settings_dialog.autostart_checkbox.setChecked(False)
+        _settings_dialog.minimized_checkbox.setChecked(False)
+        _settings_dialog.restore_checkbox.setChecked(False)
+        _settings_dialog.AUTOSTART_DIR = tmp_path
+        _settings_dialog.AUTOSTART_FILE = tmp_path / "vpn-toggle-v2.desktop"
+        return _settings_dialog
+
+    def test_create_autostart_file(self, settings_dialog):
         """SettingsDialog creates autostart .desktop file when enabled."""
-        dialog = SettingsDialog(config_manager)
-        dialog.autostart_checkbox.setChecked(True)
-        dialog.minimized_checkbox.setChecked(False)
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
-            dialog.AUTOSTART_DIR = tmpdir_path
-            dialog.AUTOSTART_FILE = tmpdir_path / "vpn-toggle-v2.desktop"
-            dialog.apply_autostart()
-
-            assert dialog.AUTOSTART_FILE.exists()
-            content = dialog.AUTOSTART_FILE.read_text()
-            assert "vpn-toggle-v2" in content
-            assert "--minimized" not in content
-
-    def test_create_autostart_file_minimized(self, qapp, config_manager):
-        """Autostart file includes --minimized when option is checked."""
-        dialog = SettingsDialog(config_manager)
-        dialog.autostart_checkbox.setChecked(True)
-        dialog.minimized_checkbox.setEnabled(True)
-        dialog.minimized_checkbox.setChecked(True)
+        settings_dialog.autostart_checkbox.setChecked(True)
+        settings_dialog.minimized_checkbox.setChecked(False)
+        settings_dialog.apply_autostart()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
-            dialog.AUTOSTART_DIR = tmpdir_path
-            dialog.AUTOSTART_FILE = tmpdir_path / "vpn-toggle-v2.desktop"
-            dialog.apply_autostart()
+        assert settings_dialog.AUTOSTART_FILE.exists()
+        content = settings_dialog.AUTOSTART_FILE.read_text()
+        assert "vpn-toggle-v2" in content
+        assert "--minimized" not in content
 
-            content = dialog.AUTOSTART_FILE.read_text()
-            assert "--minimized" in content
+    def test_create_autostart_file_minimized(self, settings_dialog):
+        """Autostart file includes --minimized when option is checked."""
+        settings_dialog.autostart_checkbox.setChecked(True)
+        settings_dialog.minimized_checkbox.setEnabled(True)
+        settings_dialog.minimized_checkbox.setChecked(True)
+        settings_dialog.apply_autostart()
 
-    def test_remove_autostart_file(self, qapp, config_manager):
-        """Unchecking autostart removes the .desktop file."""
-        dialog = SettingsDialog(config_manager)
-        dialog.autostart_checkbox.setChecked(False)
+        content = settings_dialog.AUTOSTART_FILE.read_text()
+        assert "--minimized" in content
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
-            desktop_file = tmpdir_path / "vpn-toggle-v2.desktop"
-            desktop_file.write_text("[Desktop Entry]\n")
-            dialog.AUTOSTART_DIR = tmpdir_path
-            dialog.AUTOSTART_FILE = desktop_file
-            dialog.apply_autostart()
+    def test_remove_autostart_file(self, settings_dialog):
+        """Unchecking autostart removes the .desktop file."""
+        desktop_file = settings_dialog.AUTOSTART_FILE
+        desktop_file.write_text("[Desktop Entry]\n")
+        settings_dialog.apply_autostart()
 
-            assert not desktop_file.exists()
+        assert not desktop_file.exists()
 
-    def test_remove_autostart_file_not_present(self, qapp, config_manager):
+    def test_remove_autostart_file_not_present(self, settings_dialog):
         """Removing autostart when file doesn't exist does not error."""
-        dialog = SettingsDialog(config_manager)
-        dialog.autostart_checkbox.setChecked(False)
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
-            dialog.AUTOSTART_DIR = tmpdir_path
-            dialog.AUTOSTART_FILE = tmpdir_path / "vpn-toggle-v2.desktop"
-            dialog.apply_autostart()  # Should not raise
+        settings_dialog.apply_autostart()  # Should not raise
 
-    def test_startup_settings_returned(self, qapp, config_manager):
+    def test_startup_settings_returned(self, settings_dialog):
         """get_startup_settings returns checkbox values."""
-        dialog = SettingsDialog(config_manager)
-        dialog.autostart_checkbox.setChecked(True)
-        dialog.minimized_checkbox.setEnabled(True)
-        dialog.minimized_checkbox.setChecked(True)
-        dialog.restore_checkbox.setChecked(True)
+        settings_dialog.autostart_checkbox.setChecked(True)
+        settings_dialog.minimized_checkbox.setEnabled(True)
+        settings_dialog.minimized_checkbox.setChecked(True)
+        settings_dialog.restore_checkbox.setChecked(True)
 
-        settings = dialog.get_startup_settings()
+        settings = settings_dialog.get_startup_settings()
         assert settings == {
             'autostart': True,
             'start_minimized': True,
@@ -315,58 +398,56 @@ class TestAutostart:
 class TestVPNRestore:
     """Test suite for VPN connection restore on startup."""
 
-    def test_restore_connects_vpns(self, qapp, config_manager, vpn_manager):
+    def test_restore_connects_vpns(self, qtbot, config_manager, vpn_manager):
         """Restore connects VPNs from the restore list."""
-        import time
-
         config_manager.update_startup_settings(restore_connections=True)
         config_manager.add_restore_vpn("vpn-1")
         config_manager.add_restore_vpn("vpn-2")
 
-        with patch.object(vpn_manager, 'list_vpns', return_value=[]):
-            with patch.object(vpn_manager, 'is_vpn_active', return_value=False):
-                with patch.object(vpn_manager, 'connect_vpn', return_value=(True, "Connected")) as mock_connect:
-                    window = VPNToggleMainWindow(config_manager, vpn_manager)
-                    # Restore runs in a background thread
-                    time.sleep(0.3)
-                    qapp.processEvents()
-                    calls = mock_connect.call_args_list
-                    assert call("vpn-1") in calls
-                    assert call("vpn-2") in calls
-                    window.close()
-
-    def test_restore_skips_already_active(self, qapp, config_manager, vpn_manager):
+        connected = []
+        vpn_manager.list_vpns = lambda: []
+        vpn_manager.is_vpn_active = lambda name: False
+        vpn_manager.connect_vpn = lambda name: connected.append(name) or (True, "Connected")
+        window = VPNToggleMainWindow(config_manager, vpn_manager)
+        qtbot.addWidget(window)
+        # Restore runs in a background thread
+        time.sleep(0.3)
+        qtbot.wait(0)
+        assert "vpn-1" in connected
+        assert "vpn-2" in connected
+
+    def test_restore_skips_already_active(self, qtbot, config_manager, vpn_manager):
         """Restore skips VPNs that are already active."""
         config_manager.update_startup_settings(restore_connections=True)
         config_manager.add_restore_vpn("vpn-1")
 
-        with patch.object(vpn_manager, 'list_vpns', return_value=[]):
-            with patch.object(vpn_manager, 'is_vpn_active', return_value=True):
-                with patch.object(vpn_manager, 'connect_vpn') as mock_connect:
-                    window = VPNToggleMainWindow(config_manager, vpn_manager)
-                    mock_connect.assert_not_called()
-                    window.close()
+        connected = []
+        vpn_manager.list_vpns = lambda: []
+        vpn_manager.is_vpn_active = lambda name: True
+        vpn_manager.connect_vpn = lambda name: connected.append(name) or (True, "Connected")
+        window = VPNToggleMainWindow(config_manager, vpn_manager)
+        qtbot.addWidget(window)
+        assert connected == []
 
-    def test_restore_disabled_by_default(self, qapp, config_manager, vpn_manager):
+    def test_restore_disabled_by_default(self, qtbot, config_manager, vpn_manager):
         """Restore does nothing when restore_connections is false."""
         config_manager.add_restore_vpn("vpn-1")
 
-        with patch.object(vpn_manager, 'list_vpns', return_value=[]):
-            with patch.object(vpn_manager, 'connect_vpn') as mock_connect:
-                window = VPNToggleMainWindow(config_manager, vpn_manager)
-                mock_connect.assert_not_called()
-                window.close()
+        connected = []
+        vpn_manager.list_vpns = lambda: []
+        vpn_manager.connect_vpn = lambda name: connected.append(name) or (True, "Connected")
+        window = VPNToggleMainWindow(config_manager, vpn_manager)
+        qtbot.addWidget(window)
+        assert connected == []
 
-    def test_connect_adds_to_restore_list(self, qapp, config_manager):
+    def test_connect_adds_to_restore_list(self, qtbot, config_manager, vpn_manager):
         """Successful connect adds VPN to restore list."""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/nmcli\n')
-            from vpn_toggle.vpn_manager import VPNManager
-            vm = VPNManager()
+        vm = vpn_manager
 
-        with patch.object(vm, 'is_vpn_active', return_value=False):
-            with patch.object(vm, 'get_connection_timestamp', return_value=None):
-                widget = VPNWidget("test-vpn", "Test", vm, config_manager)
+        vm.is_vpn_active = lambda name: False
+        vm.get_connection_timestamp = lambda name: None
+        widget = VPNWidget("test-vpn", "Test", vm, config_manager)
+        qtbot.addWidget(widget)
 
         # Simulate the on_done callback directly (the async wrapper is
         # tested implicitly; this tests the business logic)
@@ -375,30 +456,79 @@ class TestVPNRestore:
 
         assert "test-vpn" in config_manager.get_restore_vpns()
 
-    def test_disconnect_removes_from_restore_list(self, qapp, config_manager):
+    def test_disconnect_removes_from_restore_list(self, qtbot, config_manager, vpn_manager):
         """Clicking disconnect removes VPN from restore list."""
         config_manager.add_restore_vpn("test-vpn")
 
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/nmcli\n')
-            from vpn_toggle.vpn_manager import VPNManager
-            vm = VPNManager()
+        vm = vpn_manager
 
-        with patch.object(vm, 'is_vpn_active', return_value=True):
-            with patch.object(vm, 'get_connection_timestamp', return_value=datetime.now()):
-                widget = VPNWidget("test-vpn", "Test", vm, config_manager)
+        vm.is_vpn_active = lambda name: True
+        vm.get_connection_timestamp = lambda name: datetime.now()
+        widget = VPNWidget("test-vpn", "Test", vm, config_manager)
+        qtbot.addWidget(widget)
 
-        with patch.object(vm, 'disconnect_vpn'):
-            with patch.object(widget, 'update_status'):
-                widget.on_disconnect()
+        vm.disconnect_vpn = lambda name: (True, "Disconnected")
+        with patch.object(widget, 'update_status'):
+            widget.on_disconnect()
 
         assert "test-vpn" not in config_manager.get_restore_vpns()
 
 
+class TestConfigAutosave:
+    """Test suite for the event-loop debounce of autosave config writes."""
+
+    @pytest.fixture
+    def autosave_window(self, qtbot, temp_config_file, vpn_manager):
+        manager = ConfigManager(str(temp_config_file), autosave=True)
+        vpn_manager.list_vpns = lambda: []
+        window = VPNToggleMainWindow(manager, vpn_manager)
+        qtbot.addWidget(window)
+        return window
+
+    def _saved(self, window):
+        return json.loads(window.config_manager.config_path.read_bytes())
+
+    def test_worker_thread_update_saved_on_event_loop(self, qtbot, autosave_window):
+        """An update made off the main thread is written by the window's timer."""
+        saved_on = []
+        manager = autosave_window.config_manager
+        save = manager.save_config
+        manager.save_config = lambda: saved_on.append(threading.current_thread()) or save()
+
+        worker = threading.Thread(target=manager.add_restore_vpn, args=("vpn-1",))
+        worker.start()
+        worker.join()
+
+        qtbot.waitUntil(lambda: len(saved_on) > 0, timeout=1000)
+        assert saved_on == [threading.main_thread()]
+        assert self._saved(autosave_window)['startup']['restore_vpns'] == ["vpn-1"]
+
+    def test_quit_flushes_pending_changes(self, autosave_window):
+        """Quitting writes pending changes without waiting for the timer."""
+        autosave_window.config_manager.add_restore_vpn("vpn-1")
+        with patch.object(QApplication, 'quit'):
+            autosave_window.quit_application()
+
+        assert not autosave_window._config_save_timer.isActive()
+        assert self._saved(autosave_window)['startup']['restore_vpns'] == ["vpn-1"]
+
+    def test_about_to_quit_flushes_pending_changes(self, qapp, autosave_window):
+        """Any application shutdown writes changes still waiting on the timer."""
+        autosave_window.config_manager.add_restore_vpn("vpn-1")
+        QApplication.processEvents()  # deliver the dirty signal
+        assert autosave_window._config_save_timer.isActive()
+
+        qapp.aboutToQuit.emit()
+
+        assert not autosave_window._config_save_timer.isActive()
+        assert self._saved(autosave_window)['startup']['restore_vpns'] == ["vpn-1"]
+
+
 class TestSingleInstance:
     """Test suite for single-instance guard (QLocalServer/QLocalSocket)."""
 
-    SOCKET_NAME = "vpn-toggle-v2-test"
+    # Per-process name so parallel (pytest -n) workers don't share a socket
+    SOCKET_NAME = f"vpn-toggle-v2-test-{os.getpid()}"
 
     def test_server_listens(self, qapp):
         """QLocalServer can listen on a named socket."""
@@ -431,7 +561,7 @@ class TestSingleInstance:
         connected = socket.waitForConnected(500)
         assert not connected
 
-    def test_server_receives_connection(self, qapp):
+    def test_server_receives_connection(self, qtbot):
         """Server's newConnection signal fires when client connects."""
         QLocalServer.removeServer(self.SOCKET_NAME)
         server = QLocalServer()
@@ -444,8 +574,7 @@ class TestSingleInstance:
         socket.connectToServer(self.SOCKET_NAME)
         socket.waitForConnected(1000)
 
-        qapp.processEvents()
-        assert len(connections) == 1
+        qtbot.waitUntil(lambda: len(connections) == 1, timeout=1000)
 
         socket.disconnectFromServer()
         server.close()
@@ -455,15 +584,15 @@ class TestSingleInstance:
 class TestTrayIcon:
     """Test suite for tray icon rendering with icon_path."""
 
-    def test_icon_path_stored(self, qapp, config_manager, vpn_manager):
+    def test_icon_path_stored(self, qtbot, config_manager, vpn_manager):
         """VPNToggleMainWindow stores the icon_path attribute."""
         icon_path = Path("/tmp/test-icon.svg")
-        with patch.object(vpn_manager, 'list_vpns', return_value=[]):
-            window = VPNToggleMainWindow(
-                config_manager, vpn_manager, icon_path=icon_path,
-            )
-            assert window._icon_path == icon_path
-            window.close()
+        vpn_manager.list_vpns = lambda: []
+        window = VPNToggleMainWindow(
+            config_manager, vpn_manager, icon_path=icon_path,
+        )
+        qtbot.addWidget(window)
+        assert window._icon_path == icon_path
 
     def test_icon_path_defaults_to_none(self, main_window):
         """icon_path defaults to None when not provided."""
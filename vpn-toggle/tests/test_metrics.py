@@ -3,8 +3,6 @@ Tests for MetricsCollector
 """
 import json
 import pytest
-import tempfile
-from pathlib import Path
 
 from vpn_toggle.metrics import (
     MetricsCollector, DataPoint, AssertDetail, AggregateStats,
@@ -28,9 +26,8 @@ def _make_point(vpn: str = "test-vpn", latency: float = 500.0,
 
 
 @pytest.fixture
-def metrics_dir():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir) / "metrics"
+def metrics_dir(tmp_path):
+    return tmp_path / "metrics"
 
 
 @pytest.fixture
@@ -95,6 +92,16 @@ class TestRecordAndRetrieve:
         assert retrieved.bounce_triggered is True
         assert retrieved.success is False
 
+    def test_record_many_across_vpns(self, collector):
+        collector.record_many([
+            _make_point(vpn="vpn-a", latency=100.0),
+            _make_point(vpn="vpn-b", latency=200.0),
+            _make_point(vpn="vpn-a", latency=300.0),
+        ])
+
+        assert [p.latency_ms for p in collector.get_data_points("vpn-a")] == [100.0, 300.0]
+        assert [p.latency_ms for p in collector.get_data_points("vpn-b")] == [200.0]
+
 
 class TestAggregateStats:
 
@@ -141,6 +148,18 @@ class TestAggregateStats:
         assert stats.total_failures == 5
         assert stats.uptime_pct == 0.0
 
+    def test_stats_cached_until_next_record(self, collector):
+        collector.record(_make_point(latency=100.0))
+
+        first = collector.get_stats("test-vpn")
+        assert collector.get_stats("test-vpn") is first
+
+        collector.record(_make_point(latency=300.0))
+        second = collector.get_stats("test-vpn")
+        assert second is not first
+        assert second.total_checks == 2
+        assert second.avg_latency_ms == 200.0
+
 
 class TestPersistence:
 
@@ -160,6 +179,16 @@ class TestPersistence:
         assert points[1].success is False
         assert points[1].bounce_triggered is True
 
+    def test_save_and_reload_without_orjson(self, metrics_dir, monkeypatch):
+        monkeypatch.setattr("vpn_toggle.metrics.orjson", None)
+        collector1 = MetricsCollector(metrics_dir=metrics_dir)
+        collector1.record(_make_point(vpn="stdlib-vpn", latency=42.0))
+
+        collector2 = MetricsCollector(metrics_dir=metrics_dir)
+        points = collector2.get_data_points("stdlib-vpn")
+        assert len(points) == 1
+        assert points[0].latency_ms == 42.0
+
     def test_save_and_reload_assert_details(self, metrics_dir):
         collector1 = MetricsCollector(metrics_dir=metrics_dir)
         collector1.record(_make_point(vpn="detail-vpn", latency=1000.0))
@@ -206,6 +235,19 @@ class TestPersistence:
         files = sorted(f.name for f in metrics_dir.glob("*.jsonl"))
         assert files == ["vpn-a.jsonl", "vpn-b.jsonl"]
 
+    def test_reload_many_vpns(self, metrics_dir):
+        collector1 = MetricsCollector(metrics_dir=metrics_dir)
+        for i in range(12):
+            collector1.record(_make_point(vpn=f"vpn-{i}", latency=float(i)))
+        with open(metrics_dir / "vpn-0.jsonl", "a") as f:
+            f.write("{truncated line\n")
+
+        collector2 = MetricsCollector(metrics_dir=metrics_dir)
+        assert len(collector2.get_all_vpn_names()) == 12
+        for i in range(12):
+            points = collector2.get_data_points(f"vpn-{i}")
+            assert [p.latency_ms for p in points] == [float(i)]
+
     def test_vpn_name_with_slashes_sanitized(self, metrics_dir):
         collector = MetricsCollector(metrics_dir=metrics_dir)
         collector.record(_make_point(vpn="corp/vpn"))
@@ -251,6 +293,20 @@ class TestPersistence:
             parsed = json.loads(line)
             assert parsed["latency_ms"] == float(i)
 
+    def test_record_many_persists_all_points(self, metrics_dir):
+        collector1 = MetricsCollector(metrics_dir=metrics_dir)
+        collector1.record_many(
+            _make_point(vpn="batch-vpn", latency=float(i)) for i in range(5)
+        )
+
+        path = metrics_dir / "batch-vpn.jsonl"
+        lines = [ln for ln in path.read_text().splitlines() if ln]
+        assert len(lines) == 5
+
+        collector2 = MetricsCollector(metrics_dir=metrics_dir)
+        points = collector2.get_data_points("batch-vpn")
+        assert [p.latency_ms for p in points] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
     def test_compaction_rewrites_file_with_bounded_tail(self, metrics_dir, monkeypatch):
         monkeypatch.setattr("vpn_toggle.metrics.MAX_DATA_POINTS", 10)
         monkeypatch.setattr("vpn_toggle.metrics.COMPACT_EVERY_N", 5)
@@ -278,6 +334,27 @@ class TestPersistence:
         assert stats.avg_latency_ms == 300.0
 
 
+class TestInMemoryCollector:
+
+    def test_persist_false_writes_nothing(self, metrics_dir):
+        collector = MetricsCollector(metrics_dir=metrics_dir, persist=False)
+        collector.record(_make_point(vpn="mem-vpn"))
+        collector.record_many([_make_point(vpn="mem-vpn"), _make_point(vpn="other-vpn")])
+
+        assert len(collector.get_data_points("mem-vpn")) == 2
+        assert collector.get_stats("other-vpn").total_checks == 1
+        assert not metrics_dir.exists()
+
+    def test_persist_false_ignores_existing_files(self, metrics_dir):
+        MetricsCollector(metrics_dir=metrics_dir).record(_make_point(vpn="disk-vpn"))
+
+        collector = MetricsCollector(metrics_dir=metrics_dir, persist=False)
+        assert collector.get_all_vpn_names() == []
+
+        collector.clear_all()
+        assert (metrics_dir / "disk-vpn.jsonl").exists()
+
+
 class TestClear:
 
     def test_clear_all(self, collector, metrics_dir):
@@ -5,19 +5,21 @@ Replaces the retired test_monitor.py. Drives the event-loop-based controller
 via QCoreApplication.processEvents and fakes the async VPNManager / assert
 primitives so tests stay in-process and deterministic.
 """
-import tempfile
 import time
 from datetime import datetime, timedelta
-from pathlib import Path
+from types import MappingProxyType
 from typing import List, Optional
-from unittest.mock import MagicMock, patch
 
 import pytest
+
+pytest.importorskip("PyQt6.QtCore", reason="PyQt6 is required for monitor tests")
+
+from PyQt6 import sip
 from PyQt6.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
 
+from vpn_toggle.asserts import AssertResult
 from vpn_toggle.config import ConfigManager
 from vpn_toggle.monitor import MonitorController, MonitorState, VPNCheckSession
-from vpn_toggle.vpn_manager import VPNManager
 
 
 @pytest.fixture(scope="module")
@@ -27,22 +29,18 @@ def qapp():
 
 
 @pytest.fixture
-def temp_config_file():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir) / "test_config.json"
+def config_manager(default_config_file):
+    return ConfigManager(str(default_config_file))
 
 
-@pytest.fixture
-def config_manager(temp_config_file):
-    with patch('subprocess.run'):
-        return ConfigManager(str(temp_config_file))
-
+_DNS_ASSERT = {'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}
 
-@pytest.fixture
-def vpn_manager():
-    with patch('subprocess.run') as mock_run:
-        mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/nmcli\n')
-        return VPNManager()
+# An enabled VPN with a single DNS assert; the tests fake the assert itself.
+# Read-only views; update_vpn_config stores a plain copy of what it is given.
+_DNS_VPN_CONFIG = MappingProxyType({
+    'name': 'test_vpn', 'enabled': True, 'asserts': [_DNS_ASSERT],
+})
+_MONITOR_SETTINGS = MappingProxyType({'grace_period_seconds': 15, 'failure_threshold': 3})
 
 
 def pump_events(timeout_ms: int = 1000, predicate=None):
@@ -97,194 +95,196 @@ class FakeAssert(QObject):
 
     def __init__(self, success: bool, message: str, parent=None):
         super().__init__(parent)
-        self._result = MagicMock(success=success, message=message)
+        self._result = AssertResult(success=success, message=message, details={})
 
     def start(self):
         QTimer.singleShot(0, lambda: self.completed.emit(self._result))
 
 
+@pytest.fixture
+def monitor(qapp, config_manager, vpn_manager):
+    """A MonitorController on the test's managers, stopped on teardown"""
+    controller = MonitorController(config_manager, vpn_manager)
+    yield controller
+    controller.stop()
+
+
+@pytest.fixture
+def fake_asserts(monkeypatch):
+    """Return an installer that makes every session assert a FakeAssert with a preset result."""
+    def install(success: bool, message: str):
+        monkeypatch.setattr(
+            "vpn_toggle.monitor.create_async_assert",
+            lambda cfg, parent=None: FakeAssert(success, message, parent=parent),
+        )
+    return install
+
+
+@pytest.fixture
+def capture():
+    """Return a recorder: capture(owner, "signal") -> list of emitted argument tuples.
+
+    Connections are disconnected on teardown, except on owners whose C++
+    object is already gone (e.g. a test-local VPNCheckSession).
+    """
+    connections = []
+
+    def _capture(owner: QObject, signal_name: str) -> List[tuple]:
+        events: List[tuple] = []
+        slot = lambda *args: events.append(args)  # noqa: E731
+        getattr(owner, signal_name).connect(slot)
+        connections.append((owner, signal_name, slot))
+        return events
+
+    yield _capture
+    for owner, signal_name, slot in connections:
+        if not sip.isdeleted(owner):
+            getattr(owner, signal_name).disconnect(slot)
+
+
 class TestControllerBasics:
 
-    def test_init(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        assert mc.config_manager is config_manager
-        assert mc.vpn_manager is vpn_manager
-        assert mc.monitoring_enabled is False
-        assert mc.failure_counts == {}
-        assert mc.last_check_times == {}
-
-    def test_enable_monitoring_updates_settings(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        mc.enable_monitoring()
-        assert mc.monitoring_enabled is True
+    def test_init(self, monitor, config_manager, vpn_manager):
+        assert monitor.config_manager is config_manager
+        assert monitor.vpn_manager is vpn_manager
+        assert monitor.monitoring_enabled is False
+        assert monitor.failure_counts == {}
+        assert monitor.last_check_times == {}
+
+    def test_enable_monitoring_updates_settings(self, monitor, config_manager):
+        monitor.enable_monitoring()
+        assert monitor.monitoring_enabled is True
         assert config_manager.get_monitor_settings()['enabled'] is True
 
-    def test_disable_monitoring_updates_settings(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        mc.monitoring_enabled = True
-        mc.disable_monitoring()
-        assert mc.monitoring_enabled is False
+    def test_disable_monitoring_updates_settings(self, monitor, config_manager):
+        monitor.monitoring_enabled = True
+        monitor.disable_monitoring()
+        assert monitor.monitoring_enabled is False
         assert config_manager.get_monitor_settings()['enabled'] is False
 
-    def test_reset_vpn_state(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        mc.failure_counts['test_vpn'] = 5
-        mc.reset_vpn_state('test_vpn')
-        assert mc.failure_counts['test_vpn'] == 0
-        assert 'test_vpn' in mc.connection_times
-        assert mc.vpn_states['test_vpn'] == MonitorState.GRACE_PERIOD
-
-    def test_get_vpn_status_tracked(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        mc.failure_counts['test_vpn'] = 2
-        mc.vpn_states['test_vpn'] = MonitorState.MONITORING
-        status = mc.get_vpn_status('test_vpn')
+    def test_reset_vpn_state(self, monitor):
+        monitor.failure_counts['test_vpn'] = 5
+        monitor.reset_vpn_state('test_vpn')
+        assert monitor.failure_counts['test_vpn'] == 0
+        assert 'test_vpn' in monitor.connection_times
+        assert monitor.vpn_states['test_vpn'] == MonitorState.GRACE_PERIOD
+
+    def test_get_vpn_status_tracked(self, monitor):
+        monitor.failure_counts['test_vpn'] = 2
+        monitor.vpn_states['test_vpn'] = MonitorState.MONITORING
+        status = monitor.get_vpn_status('test_vpn')
         assert status['state'] == MonitorState.MONITORING.value
         assert status['failure_count'] == 2
 
-    def test_get_vpn_status_untracked_defaults_to_idle(
-            self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        status = mc.get_vpn_status('unknown_vpn')
+    def test_get_vpn_status_untracked_defaults_to_idle(self, monitor):
+        status = monitor.get_vpn_status('unknown_vpn')
         assert status['state'] == MonitorState.IDLE.value
         assert status['failure_count'] == 0
 
-    def test_is_running_false_before_start(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        assert mc.isRunning() is False
+    def test_is_running_false_before_start(self, monitor):
+        assert monitor.isRunning() is False
 
-    def test_is_running_true_after_start(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        mc.start_monitoring()
+    def test_is_running_true_after_start(self, monitor):
+        monitor.start_monitoring()
         try:
-            assert mc.isRunning() is True
+            assert monitor.isRunning() is True
         finally:
-            mc.stop()
-        assert mc.isRunning() is False
+            monitor.stop()
+        assert monitor.isRunning() is False
+
+
+# One row per tick outcome. Inputs: is the VPN up, how long ago it connected,
+# the failure count going in, and the fake assert result. Expected: state and
+# failure count afterwards, whether a check_completed is emitted, whether the
+# VPN is bounced, and whether vpn_disabled fires.
+_TICK_SCENARIOS = [
+    pytest.param(False, 60, 0, True, MonitorState.IDLE, 0, False, False, False,
+                 id="idle"),
+    pytest.param(True, 0, 0, True, MonitorState.GRACE_PERIOD, 0, False, False, False,
+                 id="grace"),
+    pytest.param(True, 60, 0, True, MonitorState.MONITORING, 0, True, False, False,
+                 id="pass"),
+    pytest.param(True, 60, 0, False, MonitorState.RECONNECTING, 1, True, True, False,
+                 id="fail-bounces"),
+    pytest.param(True, 60, 2, False, MonitorState.DISABLED, 3, True, False, True,
+                 id="threshold-disables"),
+]
 
 
 class TestTickFlow:
     """Exercise _on_is_active + session start/complete on a single VPN."""
 
-    def _build_controller(self, config_manager, vpn_manager, active: bool,
-                          assert_success: bool = True, grace: int = 15):
-        mc = MonitorController(config_manager, vpn_manager)
-        mc.monitoring_enabled = True
-        # Set connection time past the grace window so asserts run.
-        mc.connection_times['test_vpn'] = datetime.now() - timedelta(seconds=grace + 30)
+    def _prime_monitor(self, monitor, vpn_manager, active: bool, connected_ago: int):
+        monitor.monitoring_enabled = True
+        monitor.connection_times['test_vpn'] = datetime.now() - timedelta(seconds=connected_ago)
 
         vpn_manager.is_vpn_active_async = lambda name, parent=None: FakeIsActiveOp(
             active, parent=parent)
-        vpn_manager.bounce_vpn_async = lambda name, parent=None: FakeBounceOp(
-            True, "Reconnected", parent=parent)
         vpn_manager.disconnect_vpn_async = lambda name, parent=None: FakeDisconnectOp(
             parent=parent)
-        return mc
-
-    def test_sets_idle_when_not_connected(self, qapp, config_manager, vpn_manager):
-        mc = self._build_controller(config_manager, vpn_manager, active=False)
-        config_manager.update_vpn_config('test_vpn', {
-            'name': 'test_vpn', 'enabled': True,
-            'asserts': [{'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}]
-        })
-        mc._tick()
-        pump_events(predicate=lambda: mc.vpn_states.get('test_vpn') == MonitorState.IDLE)
-        assert mc.vpn_states['test_vpn'] == MonitorState.IDLE
-
-    def test_grace_period_skip(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        mc.monitoring_enabled = True
-        mc.connection_times['test_vpn'] = datetime.now()  # just connected
 
-        vpn_manager.is_vpn_active_async = lambda name, parent=None: FakeIsActiveOp(
-            True, parent=parent)
-        config_manager.update_vpn_config('test_vpn', {
-            'name': 'test_vpn', 'enabled': True,
-            'asserts': [{'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}]
-        })
-        mc._tick()
-        pump_events(
-            predicate=lambda: mc.vpn_states.get('test_vpn') == MonitorState.GRACE_PERIOD)
-        assert mc.vpn_states['test_vpn'] == MonitorState.GRACE_PERIOD
-
-    def test_all_pass_emits_check_completed_success(self, qapp, config_manager, vpn_manager):
-        mc = self._build_controller(config_manager, vpn_manager, active=True)
-        config_manager.update_vpn_config('test_vpn', {
-            'name': 'test_vpn', 'enabled': True,
-            'asserts': [{'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}]
-        })
-
-        emitted: List[tuple] = []
-        mc.check_completed.connect(lambda vpn, dp: emitted.append((vpn, dp)))
-
-        with patch('vpn_toggle.monitor.create_async_assert',
-                   side_effect=lambda cfg, parent=None: FakeAssert(True, "ok", parent=parent)):
-            mc._tick()
-            pump_events(predicate=lambda: len(emitted) > 0)
-
-        assert len(emitted) == 1
-        vpn_name, dp = emitted[0]
-        assert vpn_name == 'test_vpn'
-        assert dp['success'] is True
-        assert dp['bounce_triggered'] is False
-        assert 'assert_details' in dp and len(dp['assert_details']) == 1
-
-    def test_failure_triggers_bounce(self, qapp, config_manager, vpn_manager):
-        mc = self._build_controller(config_manager, vpn_manager, active=True)
-        config_manager.update_vpn_config('test_vpn', {
-            'name': 'test_vpn', 'enabled': True,
-            'asserts': [{'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}]
-        })
+    def _prime_check(self, monitor, config_manager, vpn_manager, prior_failures: int):
+        """Configure test_vpn for a DNS check and record the bounces it triggers"""
+        if prior_failures:
+            monitor.failure_counts['test_vpn'] = prior_failures
+        config_manager.update_vpn_config('test_vpn', _DNS_VPN_CONFIG)
+        config_manager.update_monitor_settings(**_MONITOR_SETTINGS)
 
         bounce_calls: List[str] = []
         vpn_manager.bounce_vpn_async = lambda name, parent=None: (
             bounce_calls.append(name) or FakeBounceOp(True, "OK", parent=parent)
         )
+        return bounce_calls
+
+    @pytest.mark.parametrize(
+        "active,connected_ago,prior_failures,assert_success,"
+        "expected_state,expected_failures,emits_check,bounced,disabled",
+        _TICK_SCENARIOS)
+    def test_tick(self, monitor, config_manager, vpn_manager, fake_asserts, capture,
+                  active, connected_ago, prior_failures, assert_success,
+                  expected_state, expected_failures, emits_check, bounced, disabled):
+        self._prime_monitor(monitor, vpn_manager, active, connected_ago)
+        bounce_calls = self._prime_check(monitor, config_manager, vpn_manager, prior_failures)
+        fake_asserts(assert_success, "ok" if assert_success else "fail")
+        emitted = capture(monitor, 'check_completed')
+        disabled_emitted = capture(monitor, 'vpn_disabled')
+
+        monitor._tick()
+        pump_events(predicate=lambda: (
+            monitor.vpn_states.get('test_vpn') == expected_state
+            and bool(emitted) == emits_check
+            and bool(bounce_calls) == bounced
+        ), timeout_ms=1500)
+
+        assert monitor.vpn_states['test_vpn'] == expected_state
+        assert monitor.failure_counts.get('test_vpn', 0) == expected_failures
+        assert [(v, dp['success'], dp['bounce_triggered']) for v, dp in emitted] == (
+            [('test_vpn', assert_success, bounced)] if emits_check else [])
+        assert all(len(dp['assert_details']) == 1 for _, dp in emitted)
+        assert bounce_calls == (['test_vpn'] if bounced else [])
+        assert [v for v, _ in disabled_emitted] == (['test_vpn'] if disabled else [])
+
+    def test_threshold_disables_in_config(self, monitor, config_manager, vpn_manager,
+                                          fake_asserts):
+        """Crossing the failure threshold persists enabled=False for the VPN"""
+        self._prime_monitor(monitor, vpn_manager, True, 60)
+        self._prime_check(monitor, config_manager, vpn_manager, prior_failures=2)
+        fake_asserts(False, "fail")
+        assert config_manager.get_vpn_config('test_vpn')['enabled'] is True
+
+        monitor._tick()
+        pump_events(predicate=lambda: (
+            monitor.vpn_states.get('test_vpn') == MonitorState.DISABLED
+        ), timeout_ms=1500)
 
-        emitted: List[tuple] = []
-        mc.check_completed.connect(lambda vpn, dp: emitted.append((vpn, dp)))
-
-        with patch('vpn_toggle.monitor.create_async_assert',
-                   side_effect=lambda cfg, parent=None: FakeAssert(False, "fail", parent=parent)):
-            mc._tick()
-            pump_events(predicate=lambda: len(emitted) > 0)
-            pump_events(predicate=lambda: len(bounce_calls) > 0, timeout_ms=500)
-
-        assert mc.failure_counts['test_vpn'] == 1
-        assert bounce_calls == ['test_vpn']
-        assert emitted[0][1]['bounce_triggered'] is True
-
-    def test_threshold_exceeded_disables_vpn(self, qapp, config_manager, vpn_manager):
-        mc = self._build_controller(config_manager, vpn_manager, active=True)
-        mc.failure_counts['test_vpn'] = 2  # one more failure will tip past threshold=3
-        config_manager.update_vpn_config('test_vpn', {
-            'name': 'test_vpn', 'enabled': True,
-            'asserts': [{'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}]
-        })
-        config_manager.update_monitor_settings(failure_threshold=3)
-
-        disabled_emitted: List[tuple] = []
-        mc.vpn_disabled.connect(lambda v, r: disabled_emitted.append((v, r)))
-
-        with patch('vpn_toggle.monitor.create_async_assert',
-                   side_effect=lambda cfg, parent=None: FakeAssert(False, "fail", parent=parent)):
-            mc._tick()
-            pump_events(predicate=lambda: len(disabled_emitted) > 0, timeout_ms=1500)
-
-        assert mc.failure_counts['test_vpn'] == 3
-        assert mc.vpn_states['test_vpn'] == MonitorState.DISABLED
-        assert len(disabled_emitted) == 1
-        assert disabled_emitted[0][0] == 'test_vpn'
-        # Config persisted — vpn_config.enabled flipped to False
         assert config_manager.get_vpn_config('test_vpn')['enabled'] is False
 
 
 class TestResourceLifecycle:
 
-    def test_stop_cancels_active_session(self, qapp, config_manager, vpn_manager):
-        mc = MonitorController(config_manager, vpn_manager)
-        mc.monitoring_enabled = True
-        mc.connection_times['test_vpn'] = datetime.now() - timedelta(seconds=60)
+    def test_stop_cancels_active_session(self, monitor, config_manager, vpn_manager):
+        monitor.monitoring_enabled = True
+        monitor.connection_times['test_vpn'] = datetime.now() - timedelta(seconds=60)
 
         # An is_active op that never fires; stop() must still finish.
         class HangingOp(QObject):
@@ -294,60 +294,52 @@ class TestResourceLifecycle:
                 pass
 
         vpn_manager.is_vpn_active_async = lambda name, parent=None: HangingOp(parent)
-        config_manager.update_vpn_config('test_vpn', {
-            'name': 'test_vpn', 'enabled': True,
-            'asserts': [{'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}]
-        })
+        config_manager.update_vpn_config('test_vpn', _DNS_VPN_CONFIG)
 
-        mc._tick()
+        monitor._tick()
         pump_events(timeout_ms=50)
         # is_active op was registered; stop() must clean it up.
-        assert 'test_vpn' in mc._active_is_active_ops
-        mc.stop()
+        assert 'test_vpn' in monitor._active_is_active_ops
+        monitor.stop()
         # Registry is cleared.
-        assert mc._active_is_active_ops == {}
-        assert mc._active_sessions == {}
-        assert mc._active_bounces == {}
-        assert mc.isRunning() is False
+        assert monitor._active_is_active_ops == {}
+        assert monitor._active_sessions == {}
+        assert monitor._active_bounces == {}
+        assert monitor.isRunning() is False
 
 
 class TestVPNCheckSession:
 
-    def test_empty_asserts_finishes_immediately(self, qapp):
+    def test_empty_asserts_finishes_immediately(self, qapp, capture):
         session = VPNCheckSession('vpn', [])
-        results: List[tuple] = []
-        session.finished.connect(lambda p, d, e: results.append((p, d, e)))
+        results = capture(session, 'finished')
         session.start()
         pump_events(predicate=lambda: len(results) > 0)
         all_passed, details, elapsed_ms = results[0]
         assert all_passed is True
         assert details == []
 
-    def test_single_passing_assert(self, qapp):
-        session = VPNCheckSession(
-            'vpn', [{'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}])
-        results: List[tuple] = []
-        session.finished.connect(lambda p, d, e: results.append((p, d, e)))
+    def test_single_passing_assert(self, qapp, fake_asserts, capture):
+        session = VPNCheckSession('vpn', [_DNS_ASSERT])
+        results = capture(session, 'finished')
 
-        with patch('vpn_toggle.monitor.create_async_assert',
-                   side_effect=lambda cfg, parent=None: FakeAssert(True, "ok", parent=parent)):
-            session.start()
-            pump_events(predicate=lambda: len(results) > 0)
+        fake_asserts(True, "ok")
+        session.start()
+        pump_events(predicate=lambda: len(results) > 0)
 
         all_passed, details, _ = results[0]
         assert all_passed is True
         assert details[0]['success'] is True
         assert details[0]['type'] == 'dns_lookup'
 
-    def test_one_failing_assert_fails_session(self, qapp):
+    def test_one_failing_assert_fails_session(self, qapp, monkeypatch, capture):
         session = VPNCheckSession(
             'vpn',
             [
-                {'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'},
+                _DNS_ASSERT,
                 {'type': 'ping', 'host': '127.0.0.1'},
             ])
-        results: List[tuple] = []
-        session.finished.connect(lambda p, d, e: results.append((p, d, e)))
+        results = capture(session, 'finished')
 
         # First assert fails, second would pass.
         call_count = {'n': 0}
@@ -355,32 +347,30 @@ class TestVPNCheckSession:
             call_count['n'] += 1
             return FakeAssert(call_count['n'] != 1, "m", parent=parent)
 
-        with patch('vpn_toggle.monitor.create_async_assert', side_effect=fake):
-            session.start()
-            pump_events(predicate=lambda: len(results) > 0)
+        monkeypatch.setattr('vpn_toggle.monitor.create_async_assert', fake)
+        session.start()
+        pump_events(predicate=lambda: len(results) > 0)
 
         all_passed, details, _ = results[0]
         assert all_passed is False
         assert len(details) == 2
 
-    def test_cancel_stops_the_session(self, qapp):
+    def test_cancel_stops_the_session(self, qapp, monkeypatch, capture):
         class HangingAssert(QObject):
             completed = pyqtSignal(object)
 
             def start(self):
                 pass  # never emits
 
-        session = VPNCheckSession(
-            'vpn', [{'type': 'dns_lookup', 'hostname': 'x', 'expected_prefix': '1.'}])
-        results: List[tuple] = []
-        session.finished.connect(lambda p, d, e: results.append((p, d, e)))
-
-        with patch('vpn_toggle.monitor.create_async_assert',
-                   side_effect=lambda cfg, parent=None: HangingAssert(parent)):
-            session.start()
-            pump_events(timeout_ms=50)
-            session.cancel()
-            pump_events(timeout_ms=50)
+        session = VPNCheckSession('vpn', [_DNS_ASSERT])
+        results = capture(session, 'finished')
+
+        monkeypatch.setattr('vpn_toggle.monitor.create_async_assert',
+                            lambda cfg, parent=None: HangingAssert(parent))
+        session.start()
+        pump_events(timeout_ms=50)
+        session.cancel()
+        pump_events(timeout_ms=50)
 
         # Session must not emit finished after cancel
         assert results == []
@@ -2,9 +2,20 @@
 Tests for OpenVPN3Backend
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from vpn_toggle.backends.openvpn3 import OpenVPN3Backend
 
+from tests.helpers import done
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _no_sleep():
+    """Make time.sleep a no-op for the module (connect polls sleep between checks)"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('time.sleep', lambda *args, **kwargs: None)
+        yield
+
+
 NO_SESSIONS = "No sessions available"
 
 SESSIONS_CONNECTED = (
@@ -36,22 +47,22 @@ class TestOpenVPN3Backend:
 
     @patch('subprocess.run')
     def test_available_when_openvpn3_found(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n')
+        mock_run.return_value = done(returncode=0, stdout='/usr/bin/openvpn3\n')
         backend = OpenVPN3Backend()
         assert backend.available is True
         assert backend.name == 'openvpn3'
 
     @patch('subprocess.run')
     def test_unavailable_when_openvpn3_missing(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=1)
+        mock_run.return_value = done(returncode=1)
         backend = OpenVPN3Backend()
         assert backend.available is False
 
     @patch('subprocess.run')
     def test_list_vpns_empty(self, mock_run):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
-            MagicMock(returncode=0, stdout='Configuration Name    Last used\n---\n---\n', stderr=''),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout='Configuration Name    Last used\n---\n---\n', stderr=''),
         ]
         backend = OpenVPN3Backend()
         assert backend.list_vpns() == []
@@ -59,9 +70,9 @@ class TestOpenVPN3Backend:
     @patch('subprocess.run')
     def test_list_vpns_with_configs(self, mock_run):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
-            MagicMock(returncode=0, stdout=CONFIGS_OUTPUT, stderr=''),
-            MagicMock(returncode=0, stdout=NO_SESSIONS, stderr=''),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout=CONFIGS_OUTPUT, stderr=''),
+            done(returncode=0, stdout=NO_SESSIONS, stderr=''),
         ]
         backend = OpenVPN3Backend()
         vpns = backend.list_vpns()
@@ -73,9 +84,9 @@ class TestOpenVPN3Backend:
     @patch('subprocess.run')
     def test_list_vpns_with_active_session(self, mock_run):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
-            MagicMock(returncode=0, stdout=CONFIGS_OUTPUT, stderr=''),
-            MagicMock(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout=CONFIGS_OUTPUT, stderr=''),
+            done(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
         ]
         backend = OpenVPN3Backend()
         vpns = backend.list_vpns()
@@ -85,9 +96,9 @@ class TestOpenVPN3Backend:
     @patch('subprocess.run')
     def test_is_vpn_active_connected(self, mock_run):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
             # _get_sessions_for_config -> sessions-list
-            MagicMock(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
+            done(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
         ]
         backend = OpenVPN3Backend()
         assert backend.is_vpn_active('aiqlabs') is True
@@ -95,8 +106,8 @@ class TestOpenVPN3Backend:
     @patch('subprocess.run')
     def test_is_vpn_active_not_connected(self, mock_run):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
-            MagicMock(returncode=0, stdout=NO_SESSIONS, stderr=''),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout=NO_SESSIONS, stderr=''),
         ]
         backend = OpenVPN3Backend()
         assert backend.is_vpn_active('aiqlabs') is False
@@ -104,11 +115,11 @@ class TestOpenVPN3Backend:
     @patch('subprocess.run')
     def test_disconnect_vpn_success(self, mock_run):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
             # _get_sessions_for_config -> sessions-list
-            MagicMock(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
+            done(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
             # _disconnect_by_path
-            MagicMock(returncode=0, stdout='', stderr=''),
+            done(returncode=0, stdout='', stderr=''),
         ]
         backend = OpenVPN3Backend()
         success, message = backend.disconnect_vpn('aiqlabs')
@@ -118,9 +129,9 @@ class TestOpenVPN3Backend:
     @patch('subprocess.run')
     def test_disconnect_vpn_no_session(self, mock_run):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
             # _get_sessions_for_config -> no sessions
-            MagicMock(returncode=0, stdout=NO_SESSIONS, stderr=''),
+            done(returncode=0, stdout=NO_SESSIONS, stderr=''),
         ]
         backend = OpenVPN3Backend()
         success, message = backend.disconnect_vpn('aiqlabs')
@@ -128,17 +139,16 @@ class TestOpenVPN3Backend:
         assert 'No active session' in message
 
     @patch.object(OpenVPN3Backend, '_raise_browser')
-    @patch('time.sleep')
     @patch('subprocess.run')
-    def test_connect_vpn_success(self, mock_run, mock_sleep, mock_raise):
+    def test_connect_vpn_success(self, mock_run, mock_raise):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
             # check for stale sessions
-            MagicMock(returncode=0, stdout=NO_SESSIONS, stderr=''),
+            done(returncode=0, stdout=NO_SESSIONS, stderr=''),
             # session-start
-            MagicMock(returncode=0, stdout='Session started\n', stderr=''),
+            done(returncode=0, stdout='Session started\n', stderr=''),
             # first poll — connected
-            MagicMock(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
+            done(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
         ]
         backend = OpenVPN3Backend()
         success, message = backend.connect_vpn('aiqlabs', auth_timeout=10)
@@ -147,43 +157,41 @@ class TestOpenVPN3Backend:
         mock_raise.assert_called_once()
 
     @patch.object(OpenVPN3Backend, '_raise_browser')
-    @patch('time.sleep')
     @patch('subprocess.run')
-    def test_connect_vpn_cleans_stale_sessions(self, mock_run, mock_sleep, mock_raise):
+    def test_connect_vpn_cleans_stale_sessions(self, mock_run, mock_raise):
         """Connect cleans up existing sessions before starting a new one."""
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
             # check for stale sessions - finds one
-            MagicMock(returncode=0, stdout=SESSIONS_AUTH_PENDING, stderr=''),
+            done(returncode=0, stdout=SESSIONS_AUTH_PENDING, stderr=''),
             # _disconnect_all_sessions -> sessions-list
-            MagicMock(returncode=0, stdout=SESSIONS_AUTH_PENDING, stderr=''),
+            done(returncode=0, stdout=SESSIONS_AUTH_PENDING, stderr=''),
             # _disconnect_by_path
-            MagicMock(returncode=0, stdout='', stderr=''),
+            done(returncode=0, stdout='', stderr=''),
             # session-start
-            MagicMock(returncode=0, stdout='Session started\n', stderr=''),
+            done(returncode=0, stdout='Session started\n', stderr=''),
             # poll — connected
-            MagicMock(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
+            done(returncode=0, stdout=SESSIONS_CONNECTED, stderr=''),
         ]
         backend = OpenVPN3Backend()
         success, message = backend.connect_vpn('aiqlabs', auth_timeout=10)
         assert success is True
 
     @patch.object(OpenVPN3Backend, '_raise_browser')
-    @patch('time.sleep')
     @patch('subprocess.run')
-    def test_connect_vpn_auth_timeout(self, mock_run, mock_sleep, mock_raise):
+    def test_connect_vpn_auth_timeout(self, mock_run, mock_raise):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
             # check for stale sessions
-            MagicMock(returncode=0, stdout=NO_SESSIONS, stderr=''),
+            done(returncode=0, stdout=NO_SESSIONS, stderr=''),
             # session-start
-            MagicMock(returncode=0, stdout='Session started\n', stderr=''),
+            done(returncode=0, stdout='Session started\n', stderr=''),
             # polls — never connected
-        ] + [MagicMock(returncode=0, stdout=SESSIONS_AUTH_PENDING, stderr='')] * 10 + [
+        ] + [done(returncode=0, stdout=SESSIONS_AUTH_PENDING, stderr='')] * 10 + [
             # _disconnect_all_sessions -> sessions-list
-            MagicMock(returncode=0, stdout=SESSIONS_AUTH_PENDING, stderr=''),
+            done(returncode=0, stdout=SESSIONS_AUTH_PENDING, stderr=''),
             # _disconnect_by_path
-            MagicMock(returncode=0, stdout='', stderr=''),
+            done(returncode=0, stdout='', stderr=''),
         ]
         backend = OpenVPN3Backend()
         success, message = backend.connect_vpn('aiqlabs', auth_timeout=4)
@@ -193,11 +201,11 @@ class TestOpenVPN3Backend:
     @patch('subprocess.run')
     def test_connect_vpn_start_failure(self, mock_run):
         mock_run.side_effect = [
-            MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n'),
+            done(returncode=0, stdout='/usr/bin/openvpn3\n'),
             # check for stale sessions
-            MagicMock(returncode=0, stdout=NO_SESSIONS, stderr=''),
+            done(returncode=0, stdout=NO_SESSIONS, stderr=''),
             # session-start fails
-            MagicMock(returncode=1, stdout='', stderr='No config found'),
+            done(returncode=1, stdout='', stderr='No config found'),
         ]
         backend = OpenVPN3Backend()
         success, message = backend.connect_vpn('nonexistent')
@@ -206,20 +214,20 @@ class TestOpenVPN3Backend:
 
     @patch('subprocess.run')
     def test_get_connection_timestamp_returns_none(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n')
+        mock_run.return_value = done(returncode=0, stdout='/usr/bin/openvpn3\n')
         backend = OpenVPN3Backend()
         assert backend.get_connection_timestamp('aiqlabs') is None
 
     @patch('subprocess.run')
     def test_unavailable_returns_empty_list(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=1)
+        mock_run.return_value = done(returncode=1)
         backend = OpenVPN3Backend()
         assert backend.list_vpns() == []
         assert backend.is_vpn_active('foo') is False
 
     @patch('subprocess.run')
     def test_parse_configs_list_multiple(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n')
+        mock_run.return_value = done(returncode=0, stdout='/usr/bin/openvpn3\n')
         backend = OpenVPN3Backend()
 
         output = (
@@ -234,7 +242,7 @@ class TestOpenVPN3Backend:
 
     @patch('subprocess.run')
     def test_parse_sessions(self, mock_run):
-        mock_run.return_value = MagicMock(returncode=0, stdout='/usr/bin/openvpn3\n')
+        mock_run.return_value = done(returncode=0, stdout='/usr/bin/openvpn3\n')
         backend = OpenVPN3Backend()
 
         output = (
@@ -2,14 +2,22 @@
 Configuration management for VPN Toggle
 """
 import copy
+import hashlib
 import json
 import logging
+import os
 import threading
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
 from .utils import get_config_file
 
+try:
+    import orjson
+except ImportError:  # optional: faster (de)serialization, stdlib json otherwise
+    orjson = None
+
 logger = logging.getLogger('vpn_toggle.config')
 
 
@@ -44,23 +52,88 @@ DEFAULT_CONFIG = {
 }
 
 
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes. Both backends raise json.JSONDecodeError subclasses."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to 2-space-indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _digest(data: bytes) -> bytes:
+    """Short content hash used to skip rewriting unchanged config bytes."""
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _freeze(value: Any) -> Any:
+    """Deep read-only view: dicts become MappingProxyType, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain, JSON-serializable deep copy of a (possibly frozen) config value."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
+
+
+# Large enough that a config save is a single write() syscall
+_WRITE_BUFFER_SIZE = 128 * 1024
+
+# Read-only view of the defaults (sections frozen one level deep) used for merging
+_FROZEN_DEFAULT: Mapping[str, Any] = MappingProxyType({
+    key: MappingProxyType(value) if isinstance(value, dict) else value
+    for key, value in DEFAULT_CONFIG.items()
+})
+
+# Serialized once at import; written as-is when the config file is missing
+DEFAULT_CONFIG_BYTES = _dumps(DEFAULT_CONFIG)
+
+
 class ConfigManager:
     """
     Thread-safe configuration manager for VPN Toggle.
 
     Handles loading, saving, and accessing configuration data stored in JSON format.
+
+    Writers hold the lock. The 'monitor' and 'vpns' sections are replaced
+    copy-on-write rather than mutated in place, so their getters read the
+    current snapshot without taking the lock.
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    # fsync the temp file before the rename; the test suite turns this off
+    FSYNC_ON_SAVE = True
+
+    def __init__(self, config_path: Optional[str] = None, autosave: bool = False):
         """
         Initialize ConfigManager.
 
         Args:
             config_path: Optional path to config file (defaults to ~/.config/vpn-toggle/config.json)
+            autosave: If True, updates only mark the config dirty and call on_dirty;
+                the owner writes them with flush() (the GUI debounces this on the
+                Qt event loop). If False (default), every update is saved synchronously.
         """
         self.config_path = Path(config_path) if config_path else get_config_file()
         self.config = None
         self._lock = threading.RLock()  # Use RLock for reentrant locking
+        self._autosave = autosave
+        self._dirty = False
+        # Called (from the updating thread) each time autosave marks the config dirty
+        self.on_dirty: Optional[Callable[[], None]] = None
+        self._last_digest: Optional[bytes] = None  # of the bytes last read/written
         self.load_config()
 
     def load_config(self) -> dict[str, Any]:
@@ -75,13 +148,19 @@ class ConfigManager:
         with self._lock:
             if not self.config_path.exists():
                 logger.info(f"Config file not found at {self.config_path}, using defaults")
-                self.config = copy.deepcopy(DEFAULT_CONFIG)
-                self.save_config()  # Now safe with RLock
+                self.config = self._merge_with_defaults({})
+                try:
+                    self._write_atomic(DEFAULT_CONFIG_BYTES)
+                    self._last_digest = _digest(DEFAULT_CONFIG_BYTES)
+                except IOError as e:
+                    logger.error(f"Failed to save config to {self.config_path}: {e}")
                 return self.config
 
             try:
-                with open(self.config_path, 'r') as f:
-                    loaded_config = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+                loaded_config = _loads(raw)
+                self._last_digest = _digest(raw)
 
                 # Merge with defaults (in case new fields were added)
                 self.config = self._merge_with_defaults(loaded_config)
@@ -91,28 +170,71 @@ class ConfigManager:
             except (json.JSONDecodeError, IOError) as e:
                 logger.error(f"Failed to load config from {self.config_path}: {e}")
                 logger.info("Falling back to default configuration")
-                self.config = copy.deepcopy(DEFAULT_CONFIG)
+                self.config = self._merge_with_defaults({})
                 return self.config
 
     def save_config(self) -> None:
         """
         Save configuration to file.
 
-        Creates parent directories if they don't exist.
+        Creates parent directories if they don't exist. Skips the write when
+        the serialized config is identical to what was last read or written.
+        The file is replaced atomically, so a crash mid-save leaves the
+        previous config intact.
         """
         with self._lock:
             if self.config is None:
                 logger.warning("No configuration to save")
                 return
 
+            data = _dumps(self.config)
+            digest = _digest(data)
+            if digest == self._last_digest:
+                return
+
             try:
-                self.config_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(self.config_path, 'w') as f:
-                    json.dump(self.config, f, indent=2)
+                self._write_atomic(data)
+                self._last_digest = digest
                 logger.debug(f"Saved configuration to {self.config_path}")
             except IOError as e:
                 logger.error(f"Failed to save config to {self.config_path}: {e}")
 
+    def _write_atomic(self, data: bytes) -> None:
+        """Write data to a temp file, fsync (if FSYNC_ON_SAVE), then rename over the config file."""
+        self.config_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.config_path.with_name(self.config_path.name + '.tmp')
+        try:
+            with open(tmp, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(data)
+                if self.FSYNC_ON_SAVE:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, self.config_path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+
+    def flush(self) -> None:
+        """Write any pending autosave changes to disk now."""
+        with self._lock:
+            if self._dirty:
+                self._dirty = False
+                self.save_config()
+
+    def _schedule_save(self) -> None:
+        """Save now, or mark dirty and notify the owner via on_dirty."""
+        with self._lock:
+            if not self._autosave:
+                self.save_config()
+                return
+
+            self._dirty = True
+            if self.on_dirty is not None:
+                self.on_dirty()
+
     def get_config(self) -> dict[str, Any]:
         """
         Get the full configuration dictionary.
@@ -130,8 +252,7 @@ class ConfigManager:
         Returns:
             Monitor settings dictionary
         """
-        with self._lock:
-            return self.config.get('monitor', DEFAULT_CONFIG['monitor']).copy()
+        return self.config.get('monitor', DEFAULT_CONFIG['monitor']).copy()
 
     def update_monitor_settings(self, **kwargs) -> None:
         """
@@ -141,17 +262,17 @@ class ConfigManager:
             **kwargs: Monitor settings to update (enabled, check_interval_seconds, etc.)
         """
         with self._lock:
-            if 'monitor' not in self.config:
-                self.config['monitor'] = copy.deepcopy(DEFAULT_CONFIG['monitor'])
+            monitor = dict(self.config.get('monitor', DEFAULT_CONFIG['monitor']))
 
             for key, value in kwargs.items():
-                if key in self.config['monitor']:
-                    self.config['monitor'][key] = value
+                if key in monitor:
+                    monitor[key] = value
                     logger.debug(f"Updated monitor setting: {key}={value}")
 
-            self.save_config()
+            self.config['monitor'] = monitor
+            self._schedule_save()
 
-    def get_vpn_config(self, vpn_name: str) -> Optional[dict[str, Any]]:
+    def get_vpn_config(self, vpn_name: str) -> Optional[Mapping[str, Any]]:
         """
         Get configuration for a specific VPN.
 
@@ -159,24 +280,23 @@ class ConfigManager:
             vpn_name: Name of the VPN connection
 
         Returns:
-            VPN configuration dictionary or None if not found
+            Read-only view of the VPN configuration (nested lists as tuples),
+            or None if not found. Copy it (dict(...)) to modify, then pass it
+            to update_vpn_config.
         """
-        with self._lock:
-            vpns = self.config.get('vpns', [])
-            for vpn in vpns:
-                if vpn.get('name') == vpn_name:
-                    return vpn.copy()
-            return None
+        for vpn in self.config.get('vpns', []):
+            if vpn.get('name') == vpn_name:
+                return _freeze(vpn)
+        return None
 
-    def get_all_vpns(self) -> list[dict[str, Any]]:
+    def get_all_vpns(self) -> tuple[Mapping[str, Any], ...]:
         """
         Get all VPN configurations.
 
         Returns:
-            List of VPN configuration dictionaries
+            Tuple of read-only VPN configuration views
         """
-        with self._lock:
-            return [vpn.copy() for vpn in self.config.get('vpns', [])]
+        return tuple(_freeze(vpn) for vpn in self.config.get('vpns', []))
 
     def update_vpn_config(self, vpn_name: str, vpn_config: dict[str, Any]) -> None:
         """
@@ -184,25 +304,23 @@ class ConfigManager:
 
         Args:
             vpn_name: Name of the VPN connection
-            vpn_config: VPN configuration dictionary
+            vpn_config: VPN configuration dictionary (a copy is stored, so
+                frozen views from get_vpn_config are accepted too)
         """
+        vpn_config = _thaw(vpn_config)
         with self._lock:
-            if 'vpns' not in self.config:
-                self.config['vpns'] = []
-
-            # Find and update existing VPN, or append new one
-            found = False
-            for i, vpn in enumerate(self.config['vpns']):
+            # Replace existing VPN or append new one, publishing a new list
+            vpns = list(self.config.get('vpns', []))
+            for i, vpn in enumerate(vpns):
                 if vpn.get('name') == vpn_name:
-                    self.config['vpns'][i] = vpn_config
-                    found = True
+                    vpns[i] = vpn_config
                     break
+            else:
+                vpns.append(vpn_config)
 
-            if not found:
-                self.config['vpns'].append(vpn_config)
-
+            self.config['vpns'] = vpns
             logger.debug(f"Updated VPN config for: {vpn_name}")
-            self.save_config()
+            self._schedule_save()
 
     def remove_vpn_config(self, vpn_name: str) -> bool:
         """
@@ -223,7 +341,7 @@ class ConfigManager:
 
             if len(self.config['vpns']) < original_length:
                 logger.debug(f"Removed VPN config for: {vpn_name}")
-                self.save_config()
+                self._schedule_save()
                 return True
 
             return False
@@ -250,7 +368,7 @@ class ConfigManager:
             }
 
             logger.debug(f"Updated window geometry: {x},{y} {width}x{height}")
-            self.save_config()
+            self._schedule_save()
 
     def get_window_geometry(self) -> dict[str, Optional[int]]:
         """
@@ -276,7 +394,7 @@ class ConfigManager:
                     self.config['startup'][key] = value
                     logger.debug(f"Updated startup setting: {key}={value}")
 
-            self.save_config()
+            self._schedule_save()
 
     def get_restore_vpns(self) -> list[str]:
         with self._lock:
@@ -287,37 +405,49 @@ class ConfigManager:
             if 'startup' not in self.config:
                 self.config['startup'] = copy.deepcopy(DEFAULT_CONFIG['startup'])
 
-            restore_list = self.config['startup'].setdefault('restore_vpns', [])
+            restore_list = self.config['startup'].get('restore_vpns', [])
             if vpn_name not in restore_list:
-                restore_list.append(vpn_name)
+                self.config['startup']['restore_vpns'] = [*restore_list, vpn_name]
                 logger.debug(f"Added VPN to restore list: {vpn_name}")
-                self.save_config()
+                self._schedule_save()
 
     def remove_restore_vpn(self, vpn_name: str) -> None:
         with self._lock:
             restore_list = self.config.get('startup', {}).get('restore_vpns', [])
             if vpn_name in restore_list:
-                restore_list.remove(vpn_name)
+                self.config['startup']['restore_vpns'] = [
+                    name for name in restore_list if name != vpn_name
+                ]
                 logger.debug(f"Removed VPN from restore list: {vpn_name}")
-                self.save_config()
+                self._schedule_save()
 
     def _merge_with_defaults(self, loaded_config: dict[str, Any]) -> dict[str, Any]:
         """
         Merge loaded configuration with defaults to handle missing fields.
 
+        Sections are merged one level deep from the frozen defaults; no deep
+        copy is made. Nested default values (e.g. window geometry, the restore
+        list) may be shared with DEFAULT_CONFIG, so writers replace them rather
+        than mutating in place.
+
         Args:
             loaded_config: Configuration loaded from file
 
         Returns:
             Merged configuration
         """
-        merged = copy.deepcopy(DEFAULT_CONFIG)
-
-        # Deep merge for nested dictionaries
-        for key, value in loaded_config.items():
-            if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
-                merged[key] = {**merged[key], **value}
+        merged: dict[str, Any] = {}
+        for key, default in _FROZEN_DEFAULT.items():
+            value = loaded_config.get(key, default)
+            if isinstance(default, Mapping) and isinstance(value, dict):
+                merged[key] = {**default, **value}
+            elif value is default:
+                merged[key] = dict(default) if isinstance(default, Mapping) else copy.copy(default)
             else:
                 merged[key] = value
 
+        # Keep keys the defaults don't know about
+        for key, value in loaded_config.items():
+            merged.setdefault(key, value)
+
         return merged
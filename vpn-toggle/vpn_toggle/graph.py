@@ -4,16 +4,21 @@ Metrics graph widget using pyqtgraph for real-time VPN latency visualization.
 Displays a unified time-series chart with color-coded lines per VPN,
 pass/fail markers, and bounce event annotations.
 """
+import functools
 import logging
+import zlib
 from datetime import datetime
+from typing import Iterable
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QMessageBox, QGraphicsItem,
+)
 from PyQt6.QtCore import Qt
 
 import pyqtgraph as pg
 import numpy as np
 
-from .metrics import MetricsCollector, DataPoint, AssertDetail
+from .metrics import MetricsCollector, DataPoint, AssertDetail, MAX_DATA_POINTS
 
 logger = logging.getLogger('vpn_toggle.graph')
 
@@ -30,6 +35,12 @@ VPN_COLORS = [
 DEFAULT_VISIBLE_POINTS = 100
 
 
+@functools.lru_cache(maxsize=4096)
+def _iso_to_epoch(ts_str: str) -> float:
+    """Convert an ISO timestamp (naive = local time) to Unix epoch seconds."""
+    return datetime.fromisoformat(ts_str).timestamp()
+
+
 class MetricsGraphWidget(QWidget):
     """
     Widget containing the pyqtgraph chart and a Clear History button.
@@ -45,10 +56,15 @@ class MetricsGraphWidget(QWidget):
 
         # Track per-VPN plot items for updates
         self._vpn_lines: dict[str, pg.PlotDataItem] = {}
+        self._vpn_colors: dict[str, str] = {}
         self._vpn_pass_scatter: dict[str, pg.PlotDataItem] = {}
         self._vpn_fail_scatter: dict[str, pg.PlotDataItem] = {}
         self._bounce_items: list = []  # InfiniteLines + TextItems for bounces
-        self._color_index = 0
+        # Per-VPN plot data, appended to as points arrive
+        self._vpn_x: dict[str, np.ndarray] = {}
+        self._vpn_y: dict[str, np.ndarray] = {}
+        self._vpn_ok: dict[str, np.ndarray] = {}
+        self._vpn_bounce: dict[str, np.ndarray] = {}
 
         self._setup_ui()
         self._load_historical_data()
@@ -80,17 +96,28 @@ class MetricsGraphWidget(QWidget):
         layout.addWidget(self._plot_widget)
         self.setLayout(layout)
 
-    def _next_color(self) -> str:
-        color = VPN_COLORS[self._color_index % len(VPN_COLORS)]
-        self._color_index += 1
-        return color
+    def _vpn_color(self, vpn_name: str) -> str:
+        """Color for a VPN, starting from a slot derived from its name.
+
+        If that color is already used in this graph, probe forward to the
+        next free one. A VPN therefore keeps its color across runs unless it
+        collides with a VPN plotted before it; past len(VPN_COLORS) VPNs,
+        colors repeat from the name's own slot.
+        """
+        start = zlib.crc32(vpn_name.encode()) % len(VPN_COLORS)
+        used = set(self._vpn_colors.values())
+        for offset in range(len(VPN_COLORS)):
+            color = VPN_COLORS[(start + offset) % len(VPN_COLORS)]
+            if color not in used:
+                return color
+        return VPN_COLORS[start]
 
     def _ensure_vpn_series(self, vpn_name: str) -> None:
         """Create plot items for a VPN if they don't exist yet."""
         if vpn_name in self._vpn_lines:
             return
 
-        color = self._next_color()
+        color = self._vpn_colors[vpn_name] = self._vpn_color(vpn_name)
 
         # Latency line
         line = self._plot_widget.plot(
@@ -117,63 +144,70 @@ class MetricsGraphWidget(QWidget):
 
     def add_data_point(self, data_point: DataPoint) -> None:
         """Add a single new data point and update the graph."""
-        vpn_name = data_point.vpn_name
-        self._ensure_vpn_series(vpn_name)
+        self.add_data_points([data_point])
 
-        # Get all points for this VPN and rebuild the series
-        points = self.metrics_collector.get_data_points(vpn_name)
-        self._update_vpn_plot(vpn_name, points)
-
-    def _update_vpn_plot(self, vpn_name: str, points: list[DataPoint]) -> None:
-        """Rebuild a VPN's line and markers from its data points."""
-        if not points:
-            return
+    def add_data_points(self, points: Iterable[DataPoint]) -> None:
+        """Append a batch of data points, redrawing each affected VPN once."""
+        by_vpn: dict[str, list[DataPoint]] = {}
+        for p in points:
+            by_vpn.setdefault(p.vpn_name, []).append(p)
 
-        # Convert timestamps to Unix epoch seconds for DateAxisItem
-        x_vals = []
-        y_vals = []
-        pass_x, pass_y = [], []
-        fail_x, fail_y = [], []
+        for vpn_name, vpn_points in by_vpn.items():
+            self._ensure_vpn_series(vpn_name)
+            x, y, ok, bounce = self._points_to_arrays(vpn_points)
+            if vpn_name in self._vpn_x:
+                x = np.concatenate((self._vpn_x[vpn_name], x))
+                y = np.concatenate((self._vpn_y[vpn_name], y))
+                ok = np.concatenate((self._vpn_ok[vpn_name], ok))
+                bounce = np.concatenate((self._vpn_bounce[vpn_name], bounce))
+            # Same retention as the collector's in-memory tail
+            self._vpn_x[vpn_name] = x[-MAX_DATA_POINTS:]
+            self._vpn_y[vpn_name] = y[-MAX_DATA_POINTS:]
+            self._vpn_ok[vpn_name] = ok[-MAX_DATA_POINTS:]
+            self._vpn_bounce[vpn_name] = bounce[-MAX_DATA_POINTS:]
+            self._update_vpn_plot(vpn_name)
 
-        for p in points:
-            t = self._parse_ts(p.timestamp).timestamp()
-            x_vals.append(t)
-            y_vals.append(p.latency_ms)
-            if p.success:
-                pass_x.append(t)
-                pass_y.append(p.latency_ms)
-            else:
-                fail_x.append(t)
-                fail_y.append(p.latency_ms)
-
-        x_arr = np.array(x_vals, dtype=float)
-        y_arr = np.array(y_vals, dtype=float)
+    @staticmethod
+    def _points_to_arrays(points: list[DataPoint]):
+        """Convert points to (epoch x, latency y, success, bounce) arrays."""
+        n = len(points)
+        # Epoch seconds for DateAxisItem
+        x = np.fromiter((_iso_to_epoch(p.timestamp) for p in points),
+                        dtype=float, count=n)
+        y = np.fromiter((p.latency_ms for p in points), dtype=float, count=n)
+        ok = np.fromiter((p.success for p in points), dtype=bool, count=n)
+        bounce = np.fromiter((p.bounce_triggered for p in points), dtype=bool, count=n)
+        return x, y, ok, bounce
+
+    def _update_vpn_plot(self, vpn_name: str) -> None:
+        """Push a VPN's cached arrays into its line and markers."""
+        x_arr = self._vpn_x[vpn_name]
+        y_arr = self._vpn_y[vpn_name]
+        ok = self._vpn_ok[vpn_name]
+        if not len(x_arr):
+            return
 
         self._vpn_lines[vpn_name].setData(x_arr, y_arr)
-        self._vpn_pass_scatter[vpn_name].setData(pass_x, pass_y)
-        self._vpn_fail_scatter[vpn_name].setData(fail_x, fail_y)
+        self._vpn_pass_scatter[vpn_name].setData(x_arr[ok], y_arr[ok])
+        self._vpn_fail_scatter[vpn_name].setData(x_arr[~ok], y_arr[~ok])
 
         # Clear old bounce markers and re-add all
         self._clear_bounce_markers()
-        self._add_bounce_markers(points, y_arr)
+        self._add_bounce_markers(x_arr[self._vpn_bounce[vpn_name]], y_arr)
 
         # Auto-scroll to show latest data
-        if len(x_vals) > self.visible_points:
-            x_min = x_vals[-self.visible_points]
-            x_max = x_vals[-1]
+        if len(x_arr) > self.visible_points:
+            x_min = float(x_arr[-self.visible_points])
+            x_max = float(x_arr[-1])
             padding = (x_max - x_min) * 0.05
             self._plot_widget.setXRange(x_min - padding, x_max + padding)
 
-    def _add_bounce_markers(self, points: list[DataPoint],
+    def _add_bounce_markers(self, bounce_x: np.ndarray,
                             y_arr: np.ndarray) -> None:
         """Add vertical dashed lines for bounce events."""
         y_max = float(y_arr.max()) if len(y_arr) > 0 else 1000.0
 
-        for p in points:
-            if not p.bounce_triggered:
-                continue
-            t = self._parse_ts(p.timestamp).timestamp()
-
+        for t in bounce_x.tolist():
             line = pg.InfiniteLine(
                 pos=t, angle=90,
                 pen=pg.mkPen('#f44336', width=2, style=Qt.PenStyle.DashLine),
@@ -191,13 +225,24 @@ class MetricsGraphWidget(QWidget):
             self._plot_widget.removeItem(item)
         self._bounce_items.clear()
 
+    def enable_item_cache(self) -> None:
+        """Cache rendered curves and markers as device-coordinate pixmaps.
+
+        Intended for static renders (e.g. screenshots): repaints caused by
+        layout settling become pixmap blits instead of path replays. Qt drops
+        the cache on any transform change, so zoom/pan stay correct.
+        """
+        cache_mode = QGraphicsItem.CacheMode.DeviceCoordinateCache
+        for items in (self._vpn_lines, self._vpn_pass_scatter, self._vpn_fail_scatter):
+            for item in items.values():
+                item.curve.setCacheMode(cache_mode)
+                item.scatter.setCacheMode(cache_mode)
+
     def _load_historical_data(self) -> None:
         """Populate graph from persisted metrics on startup."""
         for vpn_name in self.metrics_collector.get_all_vpn_names():
             self._ensure_vpn_series(vpn_name)
-            points = self.metrics_collector.get_data_points(vpn_name)
-            if points:
-                self._update_vpn_plot(vpn_name, points)
+            self.add_data_points(self.metrics_collector.get_data_points(vpn_name))
 
     def clear_all(self) -> None:
         """Clear all graph data and reset the plot."""
@@ -209,10 +254,14 @@ class MetricsGraphWidget(QWidget):
             self._plot_widget.removeItem(self._vpn_pass_scatter[vpn])
             self._plot_widget.removeItem(self._vpn_fail_scatter[vpn])
         self._vpn_lines.clear()
+        self._vpn_colors.clear()
         self._vpn_pass_scatter.clear()
         self._vpn_fail_scatter.clear()
+        self._vpn_x.clear()
+        self._vpn_y.clear()
+        self._vpn_ok.clear()
+        self._vpn_bounce.clear()
         self._clear_bounce_markers()
-        self._color_index = 0
 
         # Clear and re-add legend
         self._legend.clear()
@@ -228,7 +277,3 @@ class MetricsGraphWidget(QWidget):
         )
         if reply == QMessageBox.StandardButton.Yes:
             self.clear_all()
-
-    @staticmethod
-    def _parse_ts(ts_str: str) -> datetime:
-        return datetime.fromisoformat(ts_str)
@@ -2,18 +2,19 @@
 Main window for VPN Toggle
 """
 import logging
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QCheckBox, QTextEdit,
+    QPushButton, QLabel, QCheckBox, QPlainTextEdit,
     QScrollArea, QGroupBox, QDialog, QSplitter,
     QMessageBox, QApplication,
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QTextCursor, QIcon
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QIcon
 
 from .config import ConfigManager
 from .vpn_manager import VPNManager
@@ -31,6 +32,12 @@ class VPNToggleMainWindow(QMainWindow):
     """Main window for VPN Toggle application"""
 
     MAX_LOG_LINES = 500
+    LOG_FLUSH_INTERVAL_MS = 50
+    CONFIG_SAVE_DELAY_MS = 100
+
+    # Emitted by ConfigManager.on_dirty from whichever thread made the update;
+    # the queued delivery lands the save on the main event loop
+    _config_dirty = pyqtSignal()
 
     def __init__(self, config_manager: ConfigManager, vpn_manager: VPNManager,
                  app_icon: Optional[QIcon] = None, icon_path: Optional[Path] = None):
@@ -45,6 +52,25 @@ class VPNToggleMainWindow(QMainWindow):
         self._icon_path = icon_path
         self._quitting = False
 
+        # Lines not yet shown in the activity log, flushed by a coalescing timer
+        self._log_buffer: deque[str] = deque(maxlen=self.MAX_LOG_LINES)
+        self._log_flush_timer = QTimer()
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+
+        # Autosave configs are written here, on the event loop, a beat after
+        # the first change so a burst of updates costs one save
+        self._config_save_timer = QTimer()
+        self._config_save_timer.setSingleShot(True)
+        self._config_save_timer.setInterval(self.CONFIG_SAVE_DELAY_MS)
+        self._config_save_timer.timeout.connect(self.config_manager.flush)
+        self._config_dirty.connect(self._schedule_config_save)
+        config_manager.on_dirty = self._config_dirty.emit
+        # Covers every shutdown path (logout, app.quit() while hidden to tray),
+        # not just quit_application/closeEvent
+        QApplication.instance().aboutToQuit.connect(self._flush_config)
+
         from . import __version__
         self.setWindowTitle(f"VPN Monitor v{__version__}")
         self.setup_ui()
@@ -131,8 +157,10 @@ class VPNToggleMainWindow(QMainWindow):
         log_group = QGroupBox("Activity Log")
         log_layout = QVBoxLayout()
 
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        # Qt drops the oldest blocks itself once the limit is reached
+        self.log_text.setMaximumBlockCount(self.MAX_LOG_LINES)
         self.log_text.setMaximumHeight(150)
         log_layout.addWidget(self.log_text)
 
@@ -270,10 +298,21 @@ class VPNToggleMainWindow(QMainWindow):
 
         threading.Thread(target=restore_worker, daemon=True).start()
 
+    def _schedule_config_save(self):
+        """Arm the config save timer unless a save is already pending."""
+        if not self._config_save_timer.isActive():
+            self._config_save_timer.start()
+
+    def _flush_config(self):
+        """Write any pending config changes now (used on shutdown)."""
+        self._config_save_timer.stop()
+        self.config_manager.flush()
+
     def quit_application(self):
         """Fully quit the application."""
         self._quitting = True
         self.save_geometry()
+        self._flush_config()
 
         if self.monitor_thread and self.monitor_thread.isRunning():
             self.monitor_thread.stop()
@@ -375,20 +414,30 @@ class VPNToggleMainWindow(QMainWindow):
         self.tray.update_tooltip(self.vpn_widgets)
 
     def append_log(self, message: str):
-        """Append message to activity log, pruning oldest lines beyond MAX_LOG_LINES"""
+        """Append message to activity log, keeping at most MAX_LOG_LINES.
+
+        Lines are queued and written to the log on the next flush, so a
+        burst of messages costs a single document update and repaint.
+        """
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
-
-        doc = self.log_text.document()
-        excess = doc.blockCount() - self.MAX_LOG_LINES
-        if excess > 0:
-            cursor = QTextCursor(doc)
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            for _ in range(excess):
-                cursor.movePosition(QTextCursor.MoveOperation.Down, QTextCursor.MoveMode.KeepAnchor)
-            cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
-            cursor.removeSelectedText()
-            cursor.deleteChar()
+        self._log_buffer.append(f"[{timestamp}] {message}")
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def append_log_bulk(self, messages: list[str]):
+        """Append many messages at once and render them immediately."""
+        if not messages:
+            return
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self._log_buffer.extend(f"[{timestamp}] {message}" for message in messages)
+        self._flush_log()
+
+    def _flush_log(self):
+        """Append queued lines to the activity log in one go and scroll to the end."""
+        self._log_flush_timer.stop()
+        if self._log_buffer:
+            self.log_text.appendPlainText("\n".join(self._log_buffer))
+            self._log_buffer.clear()
 
         scrollbar = self.log_text.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
@@ -498,6 +547,7 @@ class VPNToggleMainWindow(QMainWindow):
             event.ignore()
         else:
             self.save_geometry()
+            self._flush_config()
             if self.monitor_thread and self.monitor_thread.isRunning():
                 self.monitor_thread.stop()
                 logger.info("Monitor thread stopped")
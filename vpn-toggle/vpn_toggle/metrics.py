@@ -17,22 +17,50 @@ import logging
 import os
 import threading
 from collections import deque
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from .utils import get_config_dir
 
+try:
+    import orjson
+except ImportError:  # optional: faster line (de)serialization, stdlib json otherwise
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional: stream legacy .json files instead of loading whole
+    ijson = None
+
 logger = logging.getLogger('vpn_toggle.metrics')
 
 MAX_DATA_POINTS = 10_000
 # Compact the on-disk file every N appends. Keeps on-disk growth bounded
 # to ~(MAX_DATA_POINTS + COMPACT_EVERY_N) lines between compactions.
 COMPACT_EVERY_N = 500
+# Write buffer for compaction/migration rewrites: a full tail in few write() calls
+_WRITE_BUFFER_SIZE = 128 * 1024
+# Path separators in VPN names become underscores in the metrics filename
+_SANITIZE_TABLE = str.maketrans({"/": "_", "\\": "_"})
+
+
+def _dump_line(d: dict) -> bytes:
+    """Serialize one record as a JSON line (bytes, newline-terminated)."""
+    if orjson is not None:
+        return orjson.dumps(d) + b"\n"
+    return json.dumps(d).encode() + b"\n"
+
+
+def _load_line(line: bytes) -> dict:
+    """Parse one JSON line. Both backends raise json.JSONDecodeError subclasses."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AssertDetail:
     """Latency and result for a single assert within a check cycle."""
     type: str
@@ -40,7 +68,7 @@ class AssertDetail:
     success: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DataPoint:
     """One check cycle result for a single VPN."""
     timestamp: str
@@ -51,7 +79,7 @@ class DataPoint:
     assert_details: list[AssertDetail] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AggregateStats:
     """Computed statistics for a VPN's metrics history."""
     total_checks: int
@@ -66,34 +94,40 @@ class MetricsCollector:
     VPN health check data.
 
     Storage: one .jsonl file per VPN in ~/.config/vpn-toggle/metrics/.
+    With persist=False the collector is memory-only: nothing is read from
+    or written to metrics_dir.
     """
 
-    def __init__(self, metrics_dir: Optional[Path] = None):
+    def __init__(self, metrics_dir: Optional[Path] = None, persist: bool = True):
         self._lock = threading.Lock()
         self._metrics_dir = metrics_dir or (get_config_dir() / "metrics")
-        self._metrics_dir.mkdir(parents=True, exist_ok=True)
+        self._persist = persist
 
         self._data: dict[str, deque[DataPoint]] = {}
         self._appends_since_compact: dict[str, int] = {}
-        self._load_all()
+        # VPN name -> .jsonl path, so record() doesn't re-sanitize the name
+        self._file_paths: dict[str, Path] = {}
+        # Per-VPN stats, computed on first get_stats and dropped on any change
+        self._stats_cache: dict[str, AggregateStats] = {}
+        if self._persist:
+            self._metrics_dir.mkdir(parents=True, exist_ok=True)
+            self._load_all()
 
     # -- Public API --
 
     def record(self, data_point: DataPoint) -> None:
         """Record a new data point: append to disk, update in-memory tail."""
         with self._lock:
-            vpn = data_point.vpn_name
-            if vpn not in self._data:
-                self._data[vpn] = deque(maxlen=MAX_DATA_POINTS)
-                self._appends_since_compact[vpn] = 0
-            self._data[vpn].append(data_point)
+            self._ingest(data_point.vpn_name, [data_point])
 
-            self._append_line(vpn, data_point)
-
-            self._appends_since_compact[vpn] += 1
-            if self._appends_since_compact[vpn] >= COMPACT_EVERY_N:
-                self._compact(vpn)
-                self._appends_since_compact[vpn] = 0
+    def record_many(self, data_points: Iterable[DataPoint]) -> None:
+        """Record several data points, appending each VPN's batch in one write."""
+        by_vpn: dict[str, list[DataPoint]] = {}
+        for point in data_points:
+            by_vpn.setdefault(point.vpn_name, []).append(point)
+        with self._lock:
+            for vpn, points in by_vpn.items():
+                self._ingest(vpn, points)
 
     def get_data_points(self, vpn_name: str) -> list[DataPoint]:
         """Return a copy of all data points for a VPN."""
@@ -106,8 +140,15 @@ class MetricsCollector:
             return list(self._data.keys())
 
     def get_stats(self, vpn_name: str) -> Optional[AggregateStats]:
-        """Compute aggregate statistics for a VPN. Returns None if no data."""
+        """Compute aggregate statistics for a VPN. Returns None if no data.
+
+        Results are cached until the VPN's data changes.
+        """
         with self._lock:
+            cached = self._stats_cache.get(vpn_name)
+            if cached is not None:
+                return cached
+
             points = self._data.get(vpn_name)
             if not points:
                 return None
@@ -117,19 +158,22 @@ class MetricsCollector:
             avg_lat = sum(p.latency_ms for p in points) / total
             uptime = (total - failures) / total * 100.0
 
-            return AggregateStats(
+            stats = AggregateStats(
                 total_checks=total,
                 total_failures=failures,
                 avg_latency_ms=round(avg_lat, 1),
                 uptime_pct=round(uptime, 1),
             )
+            self._stats_cache[vpn_name] = stats
+            return stats
 
     def clear_all(self) -> None:
         """Delete all metrics data from memory and disk."""
         with self._lock:
             self._data.clear()
             self._appends_since_compact.clear()
-            for pattern in ("*.jsonl", "*.json"):
+            self._stats_cache.clear()
+            for pattern in ("*.jsonl", "*.json") if self._persist else ():
                 for f in self._metrics_dir.glob(pattern):
                     try:
                         f.unlink()
@@ -142,31 +186,51 @@ class MetricsCollector:
         with self._lock:
             self._data.pop(vpn_name, None)
             self._appends_since_compact.pop(vpn_name, None)
+            self._stats_cache.pop(vpn_name, None)
             for path in (self._vpn_file(vpn_name), self._legacy_vpn_file(vpn_name)):
-                if path.exists():
+                if self._persist and path.exists():
                     try:
                         path.unlink()
                     except OSError as e:
                         logger.warning(f"Failed to delete {path}: {e}")
             logger.info(f"Metrics cleared for {vpn_name}")
 
+    def _ingest(self, vpn: str, points: list[DataPoint]) -> None:
+        """Add points for one VPN to memory and disk. Caller must hold _lock."""
+        if vpn not in self._data:
+            self._data[vpn] = deque(maxlen=MAX_DATA_POINTS)
+            self._appends_since_compact[vpn] = 0
+        self._data[vpn].extend(points)
+        self._stats_cache.pop(vpn, None)
+        if not self._persist:
+            return
+
+        self._append_lines(vpn, points)
+
+        self._appends_since_compact[vpn] += len(points)
+        if self._appends_since_compact[vpn] >= COMPACT_EVERY_N:
+            self._compact(vpn)
+            self._appends_since_compact[vpn] = 0
+
     # -- Persistence --
 
     def _vpn_file(self, vpn_name: str) -> Path:
-        safe_name = vpn_name.replace("/", "_").replace("\\", "_")
-        return self._metrics_dir / f"{safe_name}.jsonl"
+        path = self._file_paths.get(vpn_name)
+        if path is None:
+            path = self._metrics_dir / f"{vpn_name.translate(_SANITIZE_TABLE)}.jsonl"
+            self._file_paths[vpn_name] = path
+        return path
 
     def _legacy_vpn_file(self, vpn_name: str) -> Path:
-        safe_name = vpn_name.replace("/", "_").replace("\\", "_")
-        return self._metrics_dir / f"{safe_name}.json"
+        return self._vpn_file(vpn_name).with_suffix(".json")
 
-    def _append_line(self, vpn_name: str, point: DataPoint) -> None:
-        """Append one record as a JSON line. Caller must hold _lock."""
+    def _append_lines(self, vpn_name: str, points: list[DataPoint]) -> None:
+        """Append records as JSON lines in a single write. Caller must hold _lock."""
         path = self._vpn_file(vpn_name)
         try:
-            line = json.dumps(self._point_to_dict(point))
-            with open(path, "a") as f:
-                f.write(line + "\n")
+            lines = b"".join(_dump_line(self._point_to_dict(p)) for p in points)
+            with open(path, "ab") as f:
+                f.write(lines)
         except OSError as e:
             logger.error(f"Failed to append metrics for {vpn_name}: {e}")
 
@@ -180,9 +244,9 @@ class MetricsCollector:
         tmp = path.with_suffix(".jsonl.tmp")
         points = list(self._data[vpn_name])
         try:
-            with open(tmp, "w") as f:
+            with open(tmp, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
                 for p in points:
-                    f.write(json.dumps(self._point_to_dict(p)) + "\n")
+                    f.write(_dump_line(self._point_to_dict(p)))
                 f.flush()
                 os.fsync(f.fileno())
             os.replace(tmp, path)
@@ -228,13 +292,13 @@ class MetricsCollector:
         tail: deque[DataPoint] = deque(maxlen=MAX_DATA_POINTS)
         skipped = 0
         try:
-            with open(path, "r") as f:
+            with open(path, "rb") as f:
                 for line in f:
                     line = line.strip()
                     if not line:
                         continue
                     try:
-                        tail.append(self._dict_to_point(json.loads(line)))
+                        tail.append(self._dict_to_point(_load_line(line)))
                     except (json.JSONDecodeError, KeyError, TypeError):
                         skipped += 1
         except OSError as e:
@@ -246,27 +310,35 @@ class MetricsCollector:
         return tail
 
     def _migrate_legacy_json(self, legacy_path: Path, vpn_name: str) -> Optional["deque[DataPoint]"]:
-        """Convert a legacy {vpn}.json file to {vpn}.jsonl and delete the old file."""
+        """Convert a legacy {vpn}.json file to {vpn}.jsonl and delete the old file.
+
+        With ijson installed the data_points array is streamed one record at
+        a time instead of parsing the whole file into memory first.
+        """
+        tail: deque[DataPoint] = deque(maxlen=MAX_DATA_POINTS)
+        parse_errors = (json.JSONDecodeError, KeyError, OSError)
+        if ijson is not None:
+            parse_errors += (ijson.JSONError,)
         try:
-            with open(legacy_path, "r") as f:
-                payload = json.load(f)
-            raw_points = payload.get("data_points", [])
-        except (json.JSONDecodeError, KeyError, OSError) as e:
+            with open(legacy_path, "rb") as f:
+                if ijson is not None:
+                    raw_points = ijson.items(f, "data_points.item", use_float=True)
+                else:
+                    raw_points = json.load(f).get("data_points", [])
+                for d in raw_points:
+                    try:
+                        tail.append(self._dict_to_point(d))
+                    except (KeyError, TypeError):
+                        continue
+        except parse_errors as e:
             logger.warning(f"Skipping corrupt legacy metrics file {legacy_path}: {e}")
             return None
 
-        tail: deque[DataPoint] = deque(maxlen=MAX_DATA_POINTS)
-        for d in raw_points:
-            try:
-                tail.append(self._dict_to_point(d))
-            except (KeyError, TypeError):
-                continue
-
         new_path = self._vpn_file(vpn_name)
         try:
-            with open(new_path, "w") as f:
+            with open(new_path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
                 for p in tail:
-                    f.write(json.dumps(self._point_to_dict(p)) + "\n")
+                    f.write(_dump_line(self._point_to_dict(p)))
             legacy_path.unlink()
             logger.info(f"Migrated {legacy_path.name} → {new_path.name} ({len(tail)} points)")
         except OSError as e:
@@ -284,7 +356,10 @@ class MetricsCollector:
             "latency_ms": point.latency_ms,
             "success": point.success,
             "bounce_triggered": point.bounce_triggered,
-            "assert_details": [asdict(a) for a in point.assert_details],
+            "assert_details": [
+                {"type": a.type, "latency_ms": a.latency_ms, "success": a.success}
+                for a in point.assert_details
+            ],
         }
 
     @staticmethod
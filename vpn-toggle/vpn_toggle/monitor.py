@@ -326,8 +326,7 @@ class MonitorController(QObject):
 
         vpn_config = self.config_manager.get_vpn_config(vpn_name)
         if vpn_config:
-            vpn_config['enabled'] = False
-            self.config_manager.update_vpn_config(vpn_name, vpn_config)
+            self.config_manager.update_vpn_config(vpn_name, {**vpn_config, 'enabled': False})
 
     def _emit_data_point(self, vpn_name: str, cycle_elapsed_ms: float,
                          all_passed: bool, bounce_triggered: bool,
@@ -3,6 +3,7 @@ VPN card widget for displaying a single VPN connection
 """
 import logging
 import threading
+import time
 from datetime import datetime
 from typing import Optional
 
@@ -20,6 +21,14 @@ from .metrics import MetricsCollector
 
 logger = logging.getLogger('vpn_toggle.widgets')
 
+# Zero-padded "00".."99" for the per-second connection time label
+_PAD = [f"{i:02d}" for i in range(100)]
+
+
+def _now_seconds() -> int:
+    """Whole seconds on the monotonic clock (module-level so tests can freeze it)."""
+    return int(time.monotonic())
+
 
 class VPNWidget(QFrame):
     """Widget representing a single VPN in the list"""
@@ -39,7 +48,8 @@ class VPNWidget(QFrame):
         self.metrics_collector = metrics_collector
         self.backend_type = backend_type
 
-        self._connected_since: Optional[datetime] = None
+        # Connection start as _now_seconds(); None when disconnected
+        self._connected_since_monotonic: Optional[int] = None
 
         self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
         self.setup_ui()
@@ -157,11 +167,12 @@ class VPNWidget(QFrame):
             self.details_btn.setEnabled(True)
 
             # Track connection start time (fetch from NM once, then cache)
-            if self._connected_since is None:
-                self._connected_since = (
-                    self.vpn_manager.get_connection_timestamp(self.vpn_name)
-                    or datetime.now()
-                )
+            if self._connected_since_monotonic is None:
+                now = _now_seconds()
+                started = self.vpn_manager.get_connection_timestamp(self.vpn_name)
+                if started is not None:
+                    now -= int((datetime.now() - started).total_seconds())
+                self._connected_since_monotonic = now
                 # Track as active in restore list
                 self.config_manager.add_restore_vpn(self.vpn_name)
             self.update_connection_time()
@@ -212,24 +223,22 @@ class VPNWidget(QFrame):
             self.details_btn.setEnabled(False)
             self.info_label.setText("")
             self.stats_label.setText("")
-            self._connected_since = None
+            self._connected_since_monotonic = None
             self.connection_time_label.setText("")
 
     def update_connection_time(self):
         """Update the connection time counter display (DD:HH:MM:SS)."""
-        if self._connected_since is None:
+        if self._connected_since_monotonic is None:
             self.connection_time_label.setText("")
             return
 
-        total_seconds = int((datetime.now() - self._connected_since).total_seconds())
-        if total_seconds < 0:
-            total_seconds = 0
-        days = total_seconds // 86400
-        hours = (total_seconds % 86400) // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
+        elapsed = max(0, _now_seconds() - self._connected_since_monotonic)
+        days, rem = divmod(elapsed, 86400)
+        hours, rem = divmod(rem, 3600)
+        minutes, seconds = divmod(rem, 60)
+        day_str = _PAD[days] if days < 100 else str(days)
         self.connection_time_label.setText(
-            f"{days:02d}:{hours:02d}:{minutes:02d}:{seconds:02d}"
+            f"{day_str}:{_PAD[hours]}:{_PAD[minutes]}:{_PAD[seconds]}"
         )
 
     def _set_buttons_busy(self, busy: bool):
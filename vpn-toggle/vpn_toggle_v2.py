@@ -74,7 +74,7 @@ def main():
     try:
         # Initialize components
         logger.info("Initializing VPN Toggle v2.0")
-        config_manager = ConfigManager(args.config)
+        config_manager = ConfigManager(args.config, autosave=True)
         vpn_manager = VPNManager(config_manager=config_manager)
 
         # Start GUI